@@ -11,23 +11,24 @@ Notes:
 - Exact raw format strings and behaviour depend on the installed Picamera2 / libcamera
   version and the specific camera board. The code includes fallbacks and clear
   error messages where a platform-specific tweak might be needed.
-- Saving to DNG is attempted via `rawpy` when available. As fallback, the raw
-  Bayer array is saved as a 16-bit TIFF using `tifffile` if available.
+- The raw Bayer array is saved as a 16-bit TIFF using `tifffile` if available,
+  else as a 16-bit PNG via OpenCV, else as a .npy file.
 
-Dependencies (optional): rawpy, tifffile
+Dependencies (optional, imported on first use): tifffile, opencv
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, TYPE_CHECKING
+import importlib
 import tempfile
 import os
+import threading
+import time
 import numpy as np
 from loguru import logger
 
-try:
-    import cv2
-except Exception:
-    cv2 = None
-
 try:
     from picamera2 import Picamera2
     from picamera2.encoders import JpegEncoder
@@ -40,21 +41,75 @@ if TYPE_CHECKING:
 else:
     Picamera2Type = Any
 
+try:
+    from picamera2 import MappedArray
+except Exception:
+    MappedArray = None
+
+try:
+    from picamera2.encoders import MJPEGEncoder
+    from picamera2.outputs import FileOutput
+except Exception:
+    MJPEGEncoder = None
+    FileOutput = None
+
+try:
+    from picamera2.encoders import Quality
+except Exception:
+    Quality = None
+
 try:
     import libcamera
 except Exception:
     libcamera = None
 
-# Optional libs
+# Optional libs, imported on first use: OpenCV alone costs 100+ MB resident
+# and a noticeable import time on the Pi, and many processes never need it
+_optional_modules: Dict[str, Any] = {}
+
+
+def _optional_import(name: str) -> Any:
+    """Import an optional module on first use; None if it is not installed."""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except Exception:
+            _optional_modules[name] = None
+    return _optional_modules[name]
+
 try:
-    import rawpy
+    from turbojpeg import TurboJPEG, TJPF_BGR
 except Exception:
-    rawpy = None
+    TurboJPEG = None
 
 try:
-    import tifffile
+    from numba import njit, prange
 except Exception:
-    tifffile = None
+    njit = None
+    prange = range
+
+# GPU reductions are opt-in (e.g. Jetson hosts); not worth it on the Pi's VC4
+cp = None
+if os.environ.get("NEGANUKI_USE_CUPY"):
+    try:
+        import cupy as cp
+    except Exception:
+        cp = None
+
+
+# Bayer sensor format names (packing suffixes such as "_CSI2P" stripped)
+_BAYER_FORMAT_NAMES = frozenset(
+    f"{order}{depth}"
+    for order in ("SRGGB", "SBGGR", "SGRBG", "SGBRG")
+    for depth in (8, 10, 12, 16)
+)
+
+
+def _sensor_format_name(fmt: Any) -> str:
+    """Base name of a sensor mode format, e.g. 'SRGGB12' for 'SRGGB12_CSI2P'."""
+    fourcc = getattr(fmt, "fourcc", None)
+    name = fourcc if isinstance(fourcc, str) else str(fmt)
+    return name.split("_", 1)[0]
 
 
 # CRITICAL: White balance (AwbEnable=False + fixed ColourGains) MUST remain constant
@@ -153,94 +208,467 @@ CONTROL_PRESETS: Dict[str, Dict[str, Any]] = {
 DEFAULT_MANUAL_CONTROLS: Dict[str, Any] = CONTROL_PRESETS["default"]
 
 
+if njit is not None:
+
+    def _bayer_means_loop(arr):
+        """Single pass over an even-sized RGGB mosaic returning (R, G, B) means."""
+        rows = arr.shape[0] // 2
+        cols = arr.shape[1] // 2
+        sum_r = 0
+        sum_g = 0
+        sum_b = 0
+        for i in prange(rows):
+            y = 2 * i
+            for j in range(cols):
+                x = 2 * j
+                sum_r += arr[y, x]
+                sum_g += arr[y, x + 1] + arr[y + 1, x]
+                sum_b += arr[y + 1, x + 1]
+        count = rows * cols
+        return sum_r / count, sum_g / (2 * count), sum_b / count
+
+    # Generic version, compiled lazily for whatever integer layout shows up
+    _bayer_means_kernel = njit(parallel=True, fastmath=True, cache=True)(_bayer_means_loop)
+
+    # The sensor always delivers C-contiguous uint16 frames: compile that
+    # signature eagerly (and cache it on disk) so calibration calls never
+    # pay JIT warmup or stride-generic dispatch
+    try:
+        _bayer_means_kernel_u16 = njit(
+            "UniTuple(float64, 3)(uint16[:, ::1])",
+            parallel=True, fastmath=True, cache=True, boundscheck=False,
+        )(_bayer_means_loop)
+    except Exception as e:
+        logger.warning(f"Eager Numba compilation of Bayer kernel failed: {e}")
+        _bayer_means_kernel_u16 = None
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _normalize_float_kernel(arr, out):
+        """Min-max normalize a 2D float array into uint16 `out` in two streaming passes.
+
+        Returns False (with `out` zeroed) when the array is constant.
+        """
+        rows, cols = arr.shape
+        row_min = np.empty(rows, dtype=np.float64)
+        row_max = np.empty(rows, dtype=np.float64)
+        for i in prange(rows):
+            lo = arr[i, 0]
+            hi = lo
+            for j in range(1, cols):
+                v = arr[i, j]
+                if v < lo:
+                    lo = v
+                if v > hi:
+                    hi = v
+            row_min[i] = lo
+            row_max[i] = hi
+        vmin = row_min.min()
+        vmax = row_max.max()
+        if vmax == vmin:
+            out[:, :] = 0
+            return False
+        scale = 65535.0 / (vmax - vmin)
+        for i in prange(rows):
+            for j in range(cols):
+                out[i, j] = np.uint16((arr[i, j] - vmin) * scale)
+        return True
+
+else:
+    _bayer_means_kernel = None
+    _bayer_means_kernel_u16 = None
+    _normalize_float_kernel = None
+
+
+def _bayer_means_gpu(even: np.ndarray) -> Tuple[float, float, float]:
+    """Per-channel means of an even-sized RGGB mosaic reduced on the GPU via CuPy."""
+    d = cp.asarray(even)
+    sums = (
+        d[0::2, 0::2].sum(dtype=cp.int64),
+        d[0::2, 1::2].sum(dtype=cp.int64) + d[1::2, 0::2].sum(dtype=cp.int64),
+        d[1::2, 1::2].sum(dtype=cp.int64),
+    )
+    cp.cuda.Stream.null.synchronize()
+    sum_r, sum_g, sum_b = (int(x) for x in sums)
+    count = (even.shape[0] // 2) * (even.shape[1] // 2)
+    return sum_r / count, sum_g / (2 * count), sum_b / count
+
+
+def _bayer_means(sensor_data: np.ndarray) -> Tuple[float, float, float]:
+    """Compute per-channel means of an RGGB Bayer mosaic without float64 copies.
+
+    Uses CuPy when enabled via NEGANUKI_USE_CUPY, then the Numba kernel
+    when available; otherwise falls back to NumPy reductions that accumulate
+    integer data in int64 (float only for the final division) without
+    materializing the channels.
+    A trailing odd row/column (incomplete 2x2 cell) is ignored.
+    """
+    h, w = sensor_data.shape[:2]
+    even = sensor_data[: h - h % 2, : w - w % 2]
+    if even.size == 0:
+        return 0.0, 0.0, 0.0  # no complete 2x2 cell to average
+
+    if cp is not None and even.size and np.issubdtype(even.dtype, np.integer):
+        try:
+            return _bayer_means_gpu(even)
+        except Exception as e:
+            logger.warning(f"CuPy reduction failed, using CPU path: {e}")
+
+    if (
+        _bayer_means_kernel is not None
+        and even.ndim == 2
+        and np.issubdtype(even.dtype, np.integer)
+    ):
+        even = np.ascontiguousarray(even)
+        if _bayer_means_kernel_u16 is not None and even.dtype == np.uint16:
+            return _bayer_means_kernel_u16(even)
+        return _bayer_means_kernel(even)
+
+    if np.issubdtype(even.dtype, np.integer):
+        # Exact integer sums: 25 MP x 16 bit stays far below 2**63
+        rows, cols = even.shape[0] // 2, even.shape[1] // 2
+        count = rows * cols
+        # View the mosaic as 2x2 cells and reduce all four channels in one call;
+        # q[dy, dx] is the sum of the pixels at offset (dy, dx) within each cell
+        q = even.reshape(rows, 2, cols, 2).sum(axis=(0, 2), dtype=np.int64)
+        sum_r = int(q[0, 0])
+        sum_g = int(q[0, 1]) + int(q[1, 0])
+        sum_b = int(q[1, 1])
+        return sum_r / count, sum_g / (2 * count), sum_b / count
+
+    mean_r = even[0::2, 0::2].mean(dtype=np.float64)
+    mean_g = (
+        even[0::2, 1::2].mean(dtype=np.float64) + even[1::2, 0::2].mean(dtype=np.float64)
+    ) / 2.0
+    mean_b = even[1::2, 1::2].mean(dtype=np.float64)
+    return float(mean_r), float(mean_g), float(mean_b)
+
+
+def _mjpeg_quality(quality: int) -> Any:
+    """Map a JPEG quality (1-100) onto the picamera2 Quality band MJPEGEncoder takes."""
+    if quality < 30:
+        return Quality.VERY_LOW
+    if quality < 50:
+        return Quality.LOW
+    if quality < 70:
+        return Quality.MEDIUM
+    if quality < 85:
+        return Quality.HIGH
+    return Quality.VERY_HIGH
+
+
+class _LatestFrameSink:
+    """File-like FileOutput target that keeps only the newest encoded frame."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._frame: Optional[bytes] = None
+        self._seq = 0
+
+    def write(self, data) -> int:
+        # FileOutput hands over one complete JPEG per write() call
+        frame = bytes(data)
+        with self._cond:
+            self._frame = frame
+            self._seq += 1
+            self._cond.notify_all()
+        return len(frame)
+
+    def flush(self):
+        pass
+
+    def wait_newer(self, seq: int, timeout: float) -> Tuple[Optional[bytes], int]:
+        """Return (frame, seq), waiting up to `timeout` for a frame newer than `seq`."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._seq != seq, timeout=timeout)
+            return self._frame, self._seq
+
+
 class IMX477Camera:
-    def __init__(self, resolution: Tuple[int, int] = (4056, 3040)):
+    # Channel order in memory of get_preview_stream_frame() frames: the
+    # RGB888 main stream and the converted lores stream are both BGR, so
+    # OpenCV / libjpeg-turbo (TJPF_BGR) take them without conversion
+    preview_format = "BGR"
+
+    # Fixed attribute layout: no per-instance __dict__, and slot descriptors
+    # for the attributes the preview path reads on every frame
+    __slots__ = (
+        "resolution",
+        "buffer_count",
+        "preview_size",
+        "picam",
+        "mode",
+        "_current_config",
+        "_current_preset",
+        "_custom_presets",
+        "_cached_preview_config",
+        "_cached_raw_config",
+        "_cached_still_config",
+        "_cached_config_resolution",
+        "_raw_bit_depth",
+        "_preview_resize_buf",
+        "_preview_lores_size",
+        "_preview_last_ts",
+        "_preview_dropped",
+        "_preview_drop_log_at",
+        "_available_controls",
+        "_manual_exposure_supported",
+        "_manual_gain_supported",
+        "_manual_awb_supported",
+        "_bayer_ring",
+        "_bayer_ring_pending",
+        "_bayer_ring_index",
+        "_tiff_compression",
+        "_capture_thread",
+        "_capture_stop",
+        "_switch_lock",
+        "_latest_cond",
+        "_latest_frame",
+        "_latest_seq",
+        "_preview_cursor",
+        "_tj",
+        "_stream_encoder",
+        "_stream_quality",
+        "_jpeg_sink",
+        "_jpeg_unavailable",
+        "_io_pool",
+    )
+
+    def __init__(
+        self,
+        resolution: Tuple[int, int] = (4056, 3040),
+        buffer_count: int = 2,
+        preview_size: Optional[Tuple[int, int]] = None,
+    ):
+        """
+        :param resolution: Full sensor size used for still (capture_frame) and RAW configurations.
+        :param buffer_count: Frame buffers allocated for the preview stream. Fewer
+                             in-flight buffers keep preview latency low.
+        :param preview_size: Main stream size in preview/dual mode. Defaults to half
+                             the resolution (the sensor's 2x2 binned mode).
+        """
         self.resolution = resolution
+        self.buffer_count = buffer_count
+        self.preview_size = preview_size
         self.picam: Optional[Picamera2Type] = None
         self.mode = "preview"  # preview | raw | dual
         self._current_config = None
         self._current_preset = "default"  # Track active preset
         self._custom_presets: Dict[str, Dict[str, Any]] = {}  # Store custom presets
+        # Built configurations, reused until shutdown or a resolution change
+        self._cached_preview_config: Optional[Any] = None
+        self._cached_raw_config: Optional[Any] = None
+        self._cached_still_config: Optional[Any] = None
+        self._cached_config_resolution: Optional[Tuple[Any, ...]] = None
+        # Bit depth of the configured RAW format, None until known
+        self._raw_bit_depth: Optional[int] = None
+        # Reused destinations for the downscaled preview stream, one per consumer thread
+        self._preview_resize_buf = threading.local()
+        # Size of the ISP-scaled YUV420 "lores" stream, None if not configured
+        self._preview_lores_size: Optional[Tuple[int, int]] = None
+        # Stale preview frames skipped by drain-to-latest, logged periodically
+        self._preview_last_ts: Optional[int] = None
+        self._preview_dropped = 0
+        self._preview_drop_log_at = 0.0
+        # Control support, probed on first apply_manual_controls()
+        self._available_controls: Optional[frozenset[str]] = None
+        self._manual_exposure_supported = False
+        self._manual_gain_supported = False
+        self._manual_awb_supported = False
+        # Two reusable uint16 buffers for converted Bayer frames, with the
+        # pending background write (if any) that still reads from each slot
+        self._bayer_ring: list[Optional[np.ndarray]] = [None, None]
+        self._bayer_ring_pending: list[Optional[Any]] = [None, None]
+        self._bayer_ring_index = 0
+        # zstd level 1 roughly a third smaller on Bayer data; None once unsupported
+        self._tiff_compression: Optional[Tuple[str, int]] = ("zstd", 1)
+        # Background preview capture: the thread keeps only the newest frame
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_stop = threading.Event()
+        # Held for the whole of a mode switch; preview getters only try it,
+        # so they return None instead of touching the camera mid-switch
+        self._switch_lock = threading.RLock()
+        self._latest_cond = threading.Condition()
+        self._latest_frame: Optional[np.ndarray] = None
+        self._latest_seq = 0
+        # Per-thread sequence of the last frame handed out: every consumer
+        # (one thread per preview stream) waits for frames it has not seen
+        self._preview_cursor = threading.local()
+        # libjpeg-turbo handle, created on first encode_preview_jpeg()
+        self._tj: Optional[Any] = None
+        # Encoder of the running start_stream() session, if any
+        self._stream_encoder: Optional[Any] = None
+        self._stream_quality: Optional[int] = None
+        # Newest-frame sink of the encoder started by get_preview_jpeg()
+        self._jpeg_sink: Optional[_LatestFrameSink] = None
+        # Set when the encoder could not be started; retried after reconfigure()
+        self._jpeg_unavailable = False
+        # Single worker keeps RAW files written in capture order
+        # (shut down by shutdown(), started again by initialize())
+        self._io_pool: Optional[ThreadPoolExecutor] = None
+        self._start_io_pool()
 
         if Picamera2:
             self.picam = Picamera2()
 
     # -------------------- Configuration helpers --------------------
 
+    def _invalidate_config_cache(self):
+        """Drop cached configurations so they are rebuilt on next use."""
+        self._cached_preview_config = None
+        self._cached_raw_config = None
+        self._cached_still_config = None
+        self._cached_config_resolution = None
+        self._raw_bit_depth = None
+        self._preview_lores_size = None
+
+    def _check_config_cache(self):
+        """Invalidate cached configurations if the resolution changed since they were built."""
+        key = (tuple(self.resolution), self.preview_size)
+        if self._cached_config_resolution != key:
+            self._invalidate_config_cache()
+            self._cached_config_resolution = key
+
+    def _preview_main_size(self) -> Tuple[int, int]:
+        """Main stream size for preview/dual mode."""
+        if self.preview_size is not None:
+            return tuple(self.preview_size)
+        return (self.resolution[0] // 2 & ~1, self.resolution[1] // 2 & ~1)
+
     def _create_preview_config(self):
         """Create a typical preview/still RGB configuration.
 
         This is safe and fast for on-screen preview and conventional capture.
+        The configuration is cached and reused until the resolution changes.
         """
         if not Picamera2:
             raise RuntimeError("Picamera2 not available")
 
-        config = self.picam.create_still_configuration(
-            main={"size": self.resolution, "format": "RGB888"}
-        )
+        self._check_config_cache()
+        if self._cached_preview_config is not None:
+            return self._cached_preview_config
+
+        # Reduced main stream: full-resolution frames are only needed for stills
+        preview_size = self._preview_main_size()
+        main = {"size": preview_size, "format": "RGB888"}
+        # Half-preview stream scaled by the ISP for streaming, so the CPU never
+        # has to downscale frames (YUV420 is required for lores)
+        lores_size = (preview_size[0] // 2 & ~1, preview_size[1] // 2 & ~1)
+        lores = {"size": lores_size, "format": "YUV420"}
+        try:
+            try:
+                # queue=False: never hand out a frame that was captured before the request
+                config = self.picam.create_still_configuration(
+                    main=main, lores=lores, buffer_count=self.buffer_count, queue=False
+                )
+            except TypeError:
+                # Older Picamera2 releases do not accept the queue argument
+                config = self.picam.create_still_configuration(
+                    main=main, lores=lores, buffer_count=self.buffer_count
+                )
+            self._preview_lores_size = lores_size
+        except Exception as e:
+            logger.warning(f"lores preview stream unavailable ({e}), previews will be downscaled on the CPU")
+            try:
+                config = self.picam.create_still_configuration(
+                    main=main, buffer_count=self.buffer_count, queue=False
+                )
+            except TypeError:
+                config = self.picam.create_still_configuration(
+                    main=main, buffer_count=self.buffer_count
+                )
+            self._preview_lores_size = None
+        self._cached_preview_config = config
         return config
 
+    def _create_still_config(self):
+        """Create the full-resolution RGB configuration used by capture_frame (cached)."""
+        if not Picamera2:
+            raise RuntimeError("Picamera2 not available")
+
+        self._check_config_cache()
+        if self._cached_still_config is None:
+            self._cached_still_config = self.picam.create_still_configuration(
+                main={"size": self.resolution, "format": "RGB888"}
+            )
+        return self._cached_still_config
+
     def _create_raw_config(self):
         """Create a RAW (Bayer) configuration.
 
         Uses Picamera2's sensor_modes to find available RAW formats.
-        IMX477 typically supports 12-bit RAW formats.
+        IMX477 typically supports 12-bit RAW formats. The first configuration
+        that can be built is cached, so sensor modes and format candidates are
+        only probed once per camera session.
         """
         if not Picamera2:
             raise RuntimeError("Picamera2 not available")
 
+        self._check_config_cache()
+        if self._cached_raw_config is not None:
+            return self._cached_raw_config
+
+        self._cached_raw_config = self._build_raw_config()
+        self._raw_bit_depth = self._config_bit_depth(self._cached_raw_config)
+        return self._cached_raw_config
+
+    @staticmethod
+    def _config_bit_depth(config: Any) -> Optional[int]:
+        """Bit depth of a configuration's raw stream, parsed from its format name."""
+        try:
+            name = _sensor_format_name(config["raw"]["format"])
+        except Exception:
+            return None
+        if name not in _BAYER_FORMAT_NAMES:
+            return None
+        return int(name[5:])
+
+    def _raw_mode_rank(self, mode: Dict[str, Any]) -> Tuple[bool, int, int]:
+        """Sort key for sensor modes: matching resolution first, then bit depth, then area."""
+        size = tuple(mode.get("size", (0, 0)))
+        return (size == tuple(self.resolution), mode.get("bit_depth", 0), size[0] * size[1])
+
+    def _build_raw_config(self):
+        """Probe the sensor for a usable RAW configuration (uncached)."""
         try:
             # Get available sensor modes to find RAW formats
             sensor_modes = self.picam.sensor_modes
             logger.info(f"Available sensor modes: {len(sensor_modes)}")
             
-            # Look for RAW mode - typically the first mode is full resolution RAW
+            # Pick the Bayer mode matching our resolution with the highest bit depth
             raw_mode = None
             for mode in sensor_modes:
                 logger.debug(f"Sensor mode: {mode}")
                 # IMX477 RAW modes typically have format like 'SRGGB10' or 'SRGGB12'
-                if 'format' in mode and any(x in str(mode.get('format', '')) for x in ['SRGGB', 'SBGGR', 'SGRBG', 'SGBRG', 'RGGB', 'BGGR']):
-                    raw_mode = mode
-                    logger.info(f"Found RAW mode: {mode}")
-                    break
-            
+                if 'format' in mode and _sensor_format_name(mode['format']) in _BAYER_FORMAT_NAMES:
+                    if raw_mode is None or self._raw_mode_rank(mode) > self._raw_mode_rank(raw_mode):
+                        raw_mode = mode
+
             if raw_mode:
-                # Create configuration using the sensor's native RAW mode
-                cfg = self.picam.create_still_configuration(
-                    raw={"size": self.resolution},
-                    display=None,
-                    encode=None,
-                )
-                logger.info(f"Created RAW configuration with native sensor mode")
+                logger.info(f"Found RAW mode: {raw_mode}")
+                # Build exactly one configuration from the chosen mode
+                raw = {
+                    "size": tuple(raw_mode.get("size", self.resolution)),
+                    "format": str(raw_mode.get("unpacked") or raw_mode["format"]),
+                }
+                try:
+                    cfg = self.picam.create_still_configuration(
+                        raw=raw,
+                        sensor={"output_size": raw["size"], "bit_depth": raw_mode.get("bit_depth")},
+                        display=None,
+                        encode=None,
+                    )
+                except TypeError:
+                    # Picamera2 without SensorConfiguration support
+                    cfg = self.picam.create_still_configuration(raw=raw, display=None, encode=None)
+                logger.info(f"Created RAW configuration with native sensor mode: {raw['format']}")
                 return cfg
-                
+
         except Exception as e:
             logger.warning(f"Failed to create RAW config using sensor modes: {e}")
 
-        # Fallback: Try common RAW format strings
-        raw_format_candidates = [
-            "SRGGB12",  # IMX477 native 12-bit RAW
-            "SRGGB10",  # 10-bit alternative
-            "SBGGR12",
-            "SBGGR10",
-            "SGBRG12",
-            "SGBRG10",
-        ]
-
-        for fmt in raw_format_candidates:
-            try:
-                logger.debug(f"Trying RAW format: {fmt}")
-                cfg = self.picam.create_still_configuration(
-                    raw={"size": self.resolution, "format": fmt},
-                    display=None,
-                )
-                logger.info(f"Successfully created RAW config with format: {fmt}")
-                return cfg
-            except Exception as e:
-                logger.debug(f"Format {fmt} not available: {e}")
-                continue
-
-        # Last resort: use raw without specifying format (let Picamera2 choose)
+        # No Bayer mode reported (or building from it failed). sensor_modes is
+        # the authoritative list, so guessing format strings cannot do better:
+        # use raw without specifying format (let Picamera2 choose)
         try:
             cfg = self.picam.create_still_configuration(
                 raw={"size": self.resolution},
@@ -256,6 +684,11 @@ class IMX477Camera:
         return self._create_preview_config()
 
     def reconfigure(self, mode: str):
+        """Reconfigure the camera to the requested mode (see _reconfigure)."""
+        with self._switch_lock:
+            self._reconfigure(mode)
+
+    def _reconfigure(self, mode: str):
         """Reconfigure the camera to the requested mode.
 
         mode: 'preview', 'raw', or 'dual'
@@ -269,6 +702,9 @@ class IMX477Camera:
             raise RuntimeError("Picamera2 not available on this system")
 
         logger.info(f"Reconfiguring camera from '{self.mode}' to '{mode}'")
+        self._stop_capture_loop()
+        self._stop_preview_jpeg()
+        self._jpeg_unavailable = False
 
         # stop safely
         try:
@@ -304,26 +740,110 @@ class IMX477Camera:
             self.picam.start()
             logger.info(f"Camera started successfully in '{mode}' mode")
             self.mode = mode
+            self._allocate_preview_buffer()
+            if mode in ("preview", "dual"):
+                self._start_capture_loop()
             # Apply manual controls after the camera has started
             self.apply_manual_controls()
         except Exception as e:
             logger.error(f"Failed to configure and start camera: {e}", exc_info=True)
             raise
 
+    def _allocate_preview_buffer(self):
+        """Drop the reused preview output buffers after a reconfigure.
+
+        Each consumer thread owns its buffer (see _preview_out_buffer), so
+        concurrent preview streams never overwrite a frame another one is
+        still encoding; a fresh thread-local lets them reallocate at the new
+        stream size on their next frame.
+        """
+        self._preview_resize_buf = threading.local()
+
+    def _preview_out_buffer(self, shape: Tuple[int, ...], dtype: Any) -> np.ndarray:
+        """The calling thread's reused preview output buffer, (re)allocated to `shape`."""
+        local = self._preview_resize_buf
+        buf = getattr(local, "buf", None)
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = local.buf = np.empty(shape, dtype=dtype)
+        return buf
+
     # -------------------- Public API --------------------
 
     def initialize(self, mode: str = "preview"):
-        """Initialize camera in given mode (preview | raw | dual)."""
+        """Initialize camera in given mode (preview | raw | dual).
+
+        The RAW configuration is built up front as well, so the first
+        capture_raw() does not pay for probing the sensor modes.
+        """
+        self._start_io_pool()
         self.reconfigure(mode)
+        try:
+            self._create_raw_config()
+        except Exception as e:
+            logger.warning(f"Could not prepare RAW configuration: {e}")
         logger.info("Camera initialized in mode: %s", mode)
 
+    def start_stream(self, sink: Any, quality: int = 70) -> None:
+        """Stream JPEG frames of the preview into `sink` (file-like or path).
+
+        Frames are encoded straight from the camera buffers by Picamera2's
+        MJPEGEncoder (the VideoCore hardware encoder where the Pi has one),
+        whose bitrate is set from the Quality band `quality` (1-100) falls
+        in. Without MJPEGEncoder or Quality, JpegEncoder(q=quality) encodes
+        at exactly that quality. The lores stream is encoded when configured,
+        otherwise the main stream.
+        """
+        if not self.picam:
+            raise RuntimeError("Camera not initialized")
+        if FileOutput is None:
+            raise RuntimeError("picamera2.outputs not available")
+        if self._stream_encoder is not None:
+            self.stop_stream()
+
+        name = "lores" if self._preview_lores_size is not None else "main"
+        if MJPEGEncoder is not None and Quality is not None:
+            encoder = MJPEGEncoder()
+            self.picam.start_recording(
+                encoder, FileOutput(sink), quality=_mjpeg_quality(quality), name=name
+            )
+        else:
+            encoder = JpegEncoder(q=quality)
+            self.picam.start_recording(encoder, FileOutput(sink), name=name)
+        self._stream_encoder = encoder
+        self._stream_quality = quality
+        logger.info(f"Started {type(encoder).__name__} stream on '{name}'")
+
+    def stop_stream(self) -> None:
+        """Stop the encoder started by start_stream(), leaving the camera running."""
+        self._jpeg_sink = None
+        self._stream_quality = None
+        encoder, self._stream_encoder = self._stream_encoder, None
+        if encoder is None or not self.picam:
+            return
+        try:
+            self.picam.stop_encoder(encoder)
+        except Exception as e:
+            logger.warning(f"Failed to stop stream encoder: {e}")
+
+    def _start_io_pool(self):
+        if self._io_pool is None:
+            self._io_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="imx477-io")
+
     def shutdown(self):
+        self._stop_capture_loop()
+        # Let queued RAW writes reach disk, then release the IO thread
+        if self._io_pool is not None:
+            self._io_pool.shutdown(wait=True)
+            self._io_pool = None
         if self.picam:
+            self.stop_stream()
             try:
                 self.picam.stop()
             except Exception:
                 pass
             self.picam = None
+            self._invalidate_config_cache()
+            self._available_controls = None
             logger.info("Camera stopped")
 
     def set_white_balance(self, gains: Tuple[float, float]):
@@ -369,19 +889,8 @@ class IMX477Camera:
         sensor_data = result["bayer"]
         logger.debug(f"Raw sensor data shape: {sensor_data.shape}, dtype: {sensor_data.dtype}")
 
-        # Extract RGGB channels assuming standard Bayer pattern (R at 0,0; G at 0,1 and 1,0; B at 1,1)
-        R = sensor_data[0::2, 0::2].astype(np.float64)
-        G1 = sensor_data[0::2, 1::2].astype(np.float64)
-        G2 = sensor_data[1::2, 0::2].astype(np.float64)
-        B = sensor_data[1::2, 1::2].astype(np.float64)
-
-        # Combine the two green channels
-        G = (G1 + G2) / 2.0
-
-        # Compute means
-        mean_R = R.mean()
-        mean_G = G.mean()
-        mean_B = B.mean()
+        # Channel means assuming standard Bayer pattern (R at 0,0; G at 0,1 and 1,0; B at 1,1)
+        mean_R, mean_G, mean_B = _bayer_means(sensor_data)
 
         logger.debug(f"Channel means: R={mean_R:.2f}, G={mean_G:.2f}, B={mean_B:.2f}")
 
@@ -410,6 +919,25 @@ class IMX477Camera:
         
         return (R_gain, B_gain)
 
+    def _probe_control_support(self) -> None:
+        """Record which controls this camera/libcamera build supports.
+
+        The answers do not change while the camera is open, so they are
+        computed once and reset by shutdown().
+        """
+        available: frozenset[str] = frozenset()
+        if hasattr(self.picam, "camera_controls"):
+            try:
+                available = frozenset(self.picam.camera_controls.keys())
+            except Exception:
+                available = frozenset()
+
+        controls_module = getattr(libcamera, "controls", object())
+        self._manual_exposure_supported = bool(libcamera) and hasattr(controls_module, "ExposureTimeMode")
+        self._manual_gain_supported = bool(libcamera) and hasattr(controls_module, "AnalogueGainMode")
+        self._manual_awb_supported = bool(libcamera) and hasattr(controls_module, "AwbMode")
+        self._available_controls = available
+
     def apply_manual_controls(self, overrides: Optional[Dict[str, Any]] = None) -> None:
         """Apply fixed manual controls for consistent capture settings.
 
@@ -425,23 +953,14 @@ class IMX477Camera:
             controls.update(overrides)
 
         try:
-            available: set[str] = set()
-            if hasattr(self.picam, "camera_controls"):
-                try:
-                    available = set(self.picam.camera_controls.keys())
-                except Exception:
-                    available = set()
+            if self._available_controls is None:
+                self._probe_control_support()
+            available = self._available_controls
 
             unsupported = []
-            manual_exposure_supported = bool(libcamera) and hasattr(
-                getattr(libcamera, "controls", object()), "ExposureTimeMode"
-            )
-            manual_gain_supported = bool(libcamera) and hasattr(
-                getattr(libcamera, "controls", object()), "AnalogueGainMode"
-            )
-            manual_awb_supported = bool(libcamera) and hasattr(
-                getattr(libcamera, "controls", object()), "AwbMode"
-            )
+            manual_exposure_supported = self._manual_exposure_supported
+            manual_gain_supported = self._manual_gain_supported
+            manual_awb_supported = self._manual_awb_supported
 
             if available:
                 filtered_controls = {}
@@ -598,27 +1117,102 @@ class IMX477Camera:
         logger.info(f"Created/updated custom preset '{preset_name}': {preset_controls}")
         return True
 
-    def capture_frame(self) -> np.ndarray:
-        """Capture an RGB frame (NumPy array)."""
+    def capture_frame(self, copy: bool = False) -> np.ndarray:
+        """Capture a full-resolution RGB frame (NumPy array).
+
+        The preview stream runs at a reduced size, so the camera is switched to
+        the full-resolution still configuration for this one frame and back.
+        Picamera2 already hands back a freshly allocated array, so it is
+        returned as-is; pass copy=True to force an independent copy anyway.
+        """
         if not self.picam:
             raise RuntimeError("Camera not initialized")
 
-        # If currently in raw-only mode, temporarily reconfigure to preview
-        # to capture an RGB frame, or we capture and attempt to demosaic.
+        # In raw mode take the frame from the running RAW configuration
+        # (ISP main stream, or a demosaic of the Bayer data) instead of a
+        # stop/reconfigure/start round-trip to preview.
         if self.mode == "raw":
-            logger.info("Temporarily reconfiguring to preview for capture_frame")
-            self.reconfigure("preview")
+            frame = self._capture_frame_from_raw_mode()
+            return np.array(frame) if copy else np.asarray(frame)
 
-        frame = self.picam.capture_array()
-        # ensure array is a NumPy array
-        return np.array(frame)
+        with self._capture_loop_paused():
+            if tuple(self._preview_main_size()) == tuple(self.resolution):
+                frame = self.picam.capture_array()
+            else:
+                frame = self.picam.switch_mode_and_capture_array(self._create_still_config())
+        # ensure array is a NumPy array (no copy unless requested)
+        return np.array(frame) if copy else np.asarray(frame)
+
+    def _capture_frame_from_raw_mode(self) -> np.ndarray:
+        """Capture an RGB frame while the camera runs the RAW configuration.
+
+        Still configurations carry an ISP-processed main stream next to the
+        raw one, so the ISP has already demosaiced the frame; only without a
+        usable main stream is the Bayer data demosaiced here.
+        """
+        config = self._current_config
+        frame = None
+        request = self.picam.capture_request()
+        try:
+            try:
+                frame = request.make_array("main")
+                main_format = str(config["main"]["format"])
+            except Exception:
+                frame = None
+            if frame is None:
+                bayer = self._raw_stream_array(request, config)
+        finally:
+            request.release()
+
+        if frame is not None:
+            if main_format == "BGR888":
+                # Picamera2's BGR888 is RGB in memory; match the BGR memory
+                # order of the RGB888 frames returned in preview mode
+                frame = np.ascontiguousarray(frame[..., ::-1])
+            return frame
+        return self._demosaic(bayer, config)
+
+    def _demosaic(self, bayer: np.ndarray, config: Any) -> np.ndarray:
+        """Demosaic a Bayer frame to 8-bit BGR, on the GPU when OpenCV has CUDA."""
+        cv2 = _optional_import("cv2")
+        if cv2 is None:
+            raise RuntimeError("No ISP main stream and OpenCV unavailable for demosaicing")
+
+        order = _sensor_format_name(config["raw"]["format"])[1:5]  # e.g. "RGGB"
+        code = getattr(cv2, f"COLOR_Bayer{order}2BGR")
+        if bayer.dtype != np.uint8:
+            bits = self._raw_bit_depth or 16
+            bayer = np.right_shift(bayer, bits - 8).astype(np.uint8)
+
+        cuda = getattr(cv2, "cuda", None)
+        if cuda is not None and cuda.getCudaEnabledDeviceCount() > 0:
+            gpu = cv2.cuda_GpuMat()
+            gpu.upload(bayer)
+            return cuda.demosaicing(gpu, code).download()
+        return cv2.cvtColor(bayer, code)
+
+    def capture_frame_view(self) -> memoryview:
+        """Capture a full-resolution frame as a flat, read-only byte view.
+
+        For sinks that take buffers (socket.sendall, file.write, protobuf bytes
+        fields) this avoids the extra copy of frame.tobytes(). The bytes are
+        the RGB888 main stream in row-major (height, width, 3) order.
+        """
+        frame = np.ascontiguousarray(self.capture_frame())
+        frame.flags.writeable = False
+        return memoryview(frame).cast("B")
 
     def get_preview_stream_frame(self) -> Optional[np.ndarray]:
         """Get a single frame from the preview stream without stopping/starting.
         
         This is optimized for continuous streaming when camera is already running
-        in preview mode. Returns a downscaled frame for faster network transmission.
+        in preview mode. Returns a downscaled frame for faster network transmission,
+        taken from the ISP-scaled lores stream when it is configured.
         Returns None if camera is not in preview mode or not running.
+
+        The downscaled frame is written into a buffer owned by the calling
+        thread and reused on its next call; copy it if it must outlive that
+        call.
         """
         if not self.picam:
             return None
@@ -628,29 +1222,317 @@ class IMX477Camera:
             return None
         
         try:
-            # Use capture_array for lightweight frame grab
-            frame = self.picam.capture_array()
-            
-            # Downscale to 1/4 resolution for faster streaming (1014x760 instead of 4056x3040)
-            # This makes encoding and network transfer much faster
-            if cv2 is not None:
-                height, width = frame.shape[:2]
-                new_width = width // 4
-                new_height = height // 4
-                frame_small = cv2.resize(frame, (new_width, new_height), interpolation=cv2.INTER_LINEAR)
-                return np.array(frame_small)
+            stream = self._preview_stream_name()
+            if self._capture_thread is not None:
+                frame = self._wait_latest_preview()
+                if frame is None:
+                    return None
             else:
-                # If cv2 not available, return full resolution
-                return np.array(frame)
+                frame = self._capture_preview_unless_switching(stream)
+                if frame is None:
+                    return None
+            return self._render_preview(frame, stream)
+        except Exception as e:
+            logger.debug("Preview stream frame capture failed: {}", e)
+            return None
+
+    def get_preview_yuv_frame(self) -> Optional[Tuple[np.ndarray, int, int]]:
+        """Get the newest lores preview frame as planar YUV420 (I420), unconverted.
+
+        For encoders that consume YUV directly (libjpeg-turbo's encode_from_yuv),
+        skipping the YUV -> BGR conversion of get_preview_stream_frame().
+        Returns (yuv, width, height), or None when no lores stream is configured
+        or its rows are padded (stride != width), which packed-YUV encoders
+        cannot take; callers should then fall back to get_preview_stream_frame().
+        """
+        if not self.picam or self.mode not in ("preview", "dual"):
+            return None
+        if self._preview_lores_size is None:
+            return None
+        try:
+            lores = self.picam.camera_config["lores"]
+            w, h = lores["size"]
+            if (lores.get("stride") or w) != w:
+                return None
+            if self._capture_thread is not None:
+                # The background loop only fills the slot from lores when it converts it
+                if self._preview_stream_name() != "lores":
+                    return None
+                frame = self._wait_latest_preview()
+                if frame is None:
+                    return None
+            else:
+                frame = self._capture_preview_unless_switching("lores")
+                if frame is None:
+                    return None
+            return np.ascontiguousarray(frame), w, h
+        except Exception as e:
+            logger.debug("Preview YUV frame capture failed: {}", e)
+            return None
+
+    def get_preview_jpeg(
+        self, quality: int = 75, seq: int = 0
+    ) -> Optional[Tuple[bytes, int, int, int]]:
+        """Get the newest preview frame JPEG-encoded by Picamera2's encoder.
+
+        The first call starts start_stream() into an in-memory sink, so frames
+        are encoded from the camera buffers by MJPEGEncoder (the VideoCore
+        hardware encoder where the Pi has one) with no CPU DCT work.
+
+        `seq` is the caller's own cursor: pass 0 first, then the value
+        returned by the previous call, so each consumer waits for a frame it
+        has not seen yet without taking frames from other consumers. Returns
+        (jpeg, width, height, seq), or None when not streaming a preview, no
+        encoder is available, or the running encoder was started for a
+        different `quality`; callers then encode frames themselves, at their
+        own quality. Mode switches stop the encoder; the next call restarts it.
+        """
+        if not self.picam or self.mode not in ("preview", "dual"):
+            return None
+        if FileOutput is None or self._jpeg_unavailable:
+            return None
+        try:
+            sink = self._jpeg_sink
+            if sink is None:
+                if not self._switch_lock.acquire(blocking=False):
+                    return None  # mode switch in progress: do not restart the encoder
+                try:
+                    sink = self._start_preview_jpeg(quality)
+                finally:
+                    self._switch_lock.release()
+                if sink is None:
+                    return None
+            if self._stream_quality != quality:
+                return None  # encoder runs at another client's quality
+            frame, seq = sink.wait_newer(seq, 0.5)
+            if frame is None:
+                return None
+            name = "lores" if self._preview_lores_size is not None else "main"
+            w, h = self.picam.camera_config[name]["size"]
+            return frame, w, h, seq
+        except Exception as e:
+            logger.debug("Encoded preview frame unavailable: {}", e)
+            return None
+
+    def _start_preview_jpeg(self, quality: int) -> Optional[_LatestFrameSink]:
+        """Start the encoder behind get_preview_jpeg(); caller holds _switch_lock."""
+        if self._jpeg_sink is not None:
+            return self._jpeg_sink  # another consumer started it meanwhile
+        if self.mode not in ("preview", "dual") or self._jpeg_unavailable:
+            return None
+        if self._stream_encoder is not None:
+            return None  # someone else's start_stream() session owns the encoder
+        sink = _LatestFrameSink()
+        try:
+            self.start_stream(sink, quality=quality)
         except Exception as e:
-            logger.debug(f"Preview stream frame capture failed: {e}")
+            self._jpeg_unavailable = True
+            logger.warning(f"Preview JPEG encoder unavailable: {e}")
+            return None
+        self._jpeg_sink = sink
+        return sink
+
+    def _stop_preview_jpeg(self) -> None:
+        """Stop the encoder started by get_preview_jpeg(), if it is running."""
+        if self._jpeg_sink is not None:
+            self.stop_stream()
+
+    def encode_preview_jpeg(self, quality: int = 75) -> Optional[bytes]:
+        """Grab a preview frame and JPEG-encode it; None if no frame is available.
+
+        Uses libjpeg-turbo (PyTurboJPEG) when installed, with its NEON DCT and
+        Huffman paths on ARM, else cv2.imencode. Preview frames are in BGR
+        memory order, like the RGB888 main stream.
+        """
+        frame = self.get_preview_stream_frame()
+        if frame is None:
             return None
 
+        if TurboJPEG is not None and frame.ndim == 3:
+            if self._tj is None:
+                try:
+                    self._tj = TurboJPEG()
+                except Exception as e:
+                    logger.warning(f"libjpeg-turbo unavailable, using OpenCV: {e}")
+            if self._tj is not None:
+                return self._tj.encode(frame, quality=quality, pixel_format=TJPF_BGR)
+
+        cv2 = _optional_import("cv2")
+        if cv2 is None:
+            raise RuntimeError("No JPEG encoder available (install PyTurboJPEG or OpenCV)")
+        success, buffer = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), quality])
+        if not success:
+            return None
+        return buffer.tobytes()
+
+    def _preview_stream_name(self) -> str:
+        """Stream the preview is read from: the ISP-scaled lores stream when usable."""
+        if self._preview_lores_size is not None and _optional_import("cv2") is not None:
+            return "lores"
+        return "main"
+
+    def _render_preview(self, frame: np.ndarray, stream: str) -> np.ndarray:
+        """Turn a captured preview array into the downscaled BGR frame handed to callers."""
+        cv2 = _optional_import("cv2")
+        if stream == "lores":
+            # The ISP already scaled this stream; only the colour conversion
+            # is left (BGR, the same memory order as the RGB888 main stream).
+            # Rows are `stride` wide (planes included), so convert the whole
+            # buffer and crop the padding off afterwards
+            out_shape = (frame.shape[0] * 2 // 3, frame.shape[1], 3)
+            buf = self._preview_out_buffer(out_shape, np.uint8)
+            cv2.cvtColor(frame, cv2.COLOR_YUV420p2BGR, dst=buf)
+            return buf[:, : self._preview_lores_size[0]]
+
+        # Downscale to half the preview size (1014x760 by default) for faster
+        # streaming. This makes encoding and network transfer much faster
+        if cv2 is not None:
+            height, width = frame.shape[:2]
+            new_width = width // 2
+            new_height = height // 2
+            out_shape = (new_height, new_width) + frame.shape[2:]
+            buf = self._preview_out_buffer(out_shape, frame.dtype)
+            # INTER_AREA is a box filter for integer downscales: faster and alias-free
+            cv2.resize(frame, (new_width, new_height), dst=buf, interpolation=cv2.INTER_AREA)
+            return buf
+        else:
+            # If cv2 not available, return the preview-size frame
+            return np.asarray(frame)
+
+    # -------------------- Background preview capture --------------------
+
+    def _start_capture_loop(self):
+        """Start the thread that keeps the newest preview frame in a single slot."""
+        if self._capture_thread is not None or not self.picam:
+            return
+        self._capture_stop.clear()
+        with self._latest_cond:
+            self._latest_frame = None
+        self._capture_thread = threading.Thread(
+            target=self._capture_loop, name="imx477-preview", daemon=True
+        )
+        self._capture_thread.start()
+
+    def _stop_capture_loop(self) -> bool:
+        """Stop the preview capture thread; returns True if it was running."""
+        thread, self._capture_thread = self._capture_thread, None
+        if thread is None:
+            return False
+        self._capture_stop.set()
+        with self._latest_cond:
+            self._latest_cond.notify_all()
+        thread.join(timeout=2.0)
+        return True
+
+    @contextmanager
+    def _capture_loop_paused(self):
+        """Keep the preview thread, encoder and getters off the camera while the
+        caller switches modes."""
+        with self._switch_lock:
+            was_running = self._stop_capture_loop()
+            self._stop_preview_jpeg()
+            try:
+                yield
+            finally:
+                if was_running and self.mode in ("preview", "dual"):
+                    self._start_capture_loop()
+
+    def _capture_preview_unless_switching(self, stream: str) -> Optional[np.ndarray]:
+        """Capture a preview array on the caller's thread; None during a mode switch."""
+        if not self._switch_lock.acquire(blocking=False):
+            return None
+        try:
+            if self.mode not in ("preview", "dual"):
+                return None
+            return self._capture_latest_preview_array(stream)
+        finally:
+            self._switch_lock.release()
+
+    def _capture_loop(self):
+        stream = self._preview_stream_name()
+        while not self._capture_stop.is_set():
+            try:
+                frame = self._capture_latest_preview_array(stream)
+            except Exception as e:
+                logger.debug("Background preview capture failed: {}", e)
+                self._capture_stop.wait(0.1)
+                continue
+            with self._latest_cond:
+                self._latest_frame = frame
+                self._latest_seq += 1
+                self._latest_cond.notify_all()
+
+    def _wait_latest_preview(self, timeout: float = 0.5) -> Optional[np.ndarray]:
+        """Return the newest captured preview array, waiting briefly for a new one.
+
+        Waits until a frame newer than the last one handed out to the calling
+        thread arrives (so a fast consumer does not re-send duplicates), but
+        never longer than `timeout`; after that the current slot is returned
+        as-is. Each thread keeps its own cursor, so concurrent consumers all
+        see every frame instead of taking them from each other.
+        """
+        cursor = self._preview_cursor
+        consumed = getattr(cursor, "seq", 0)
+        with self._latest_cond:
+            self._latest_cond.wait_for(
+                lambda: self._latest_seq != consumed or self._capture_stop.is_set(),
+                timeout=timeout,
+            )
+            cursor.seq = self._latest_seq
+            return self._latest_frame
+
+    def _capture_latest_preview_array(self, stream: str = "main") -> np.ndarray:
+        """Capture the freshest preview frame, discarding frames queued before the call.
+
+        A consumer slower than the sensor frame rate would otherwise be handed
+        frames that waited in Picamera2's queue. Uses capture_request(flush=True)
+        when the installed Picamera2 supports it, else plain capture_array().
+        """
+        try:
+            request = self.picam.capture_request(flush=True)
+        except TypeError:
+            return self.picam.capture_array(stream)
+
+        try:
+            frame = request.make_array(stream)
+            metadata = request.get_metadata()
+        finally:
+            request.release()
+
+        self._track_preview_drops(metadata.get("SensorTimestamp"), metadata.get("FrameDuration"))
+        return frame
+
+    def _track_preview_drops(self, timestamp_ns: Optional[int], frame_duration_us: Optional[int]):
+        """Estimate how many sensor frames were skipped and log the total every 5 seconds."""
+        last_ts = self._preview_last_ts
+        self._preview_last_ts = timestamp_ns
+        if last_ts is None or timestamp_ns is None or not frame_duration_us:
+            return
+
+        skipped = round((timestamp_ns - last_ts) / (frame_duration_us * 1000)) - 1
+        if skipped > 0:
+            self._preview_dropped += skipped
+
+        now = time.monotonic()
+        if now - self._preview_drop_log_at >= 5.0:
+            if self._preview_dropped:
+                logger.debug("Preview stream skipped {} stale frames", self._preview_dropped)
+            self._preview_dropped = 0
+            self._preview_drop_log_at = now
+
     def capture_raw(self, save_dng: bool = True, dng_path: Optional[str] = None) -> dict:
         """Capture a RAW Bayer frame and optionally save to TIFF.
         
-        Uses switch_mode_and_capture_array to temporarily capture RAW
+        Uses switch_mode_and_capture_request to temporarily capture RAW
         without fully reconfiguring the camera.
+
+        Returns a dict with "bayer" (uint16 array), "meta", "dng_path" and
+        "dng_future". "bayer" normally lives in a ring of two camera-owned
+        buffers and is overwritten two captures later; copy it if it must live
+        longer. Saving happens in the background: "dng_path" is the target
+        path, known up front, and "dng_future" a Future resolving to the path
+        actually written (.png or .npy when tifffile is missing, None if saving
+        failed). Both are None when save_dng=False.
         """
         logger.info("Starting RAW capture (save_dng=%s, dng_path=%s)", save_dng, dng_path)
         
@@ -658,8 +1540,7 @@ class IMX477Camera:
             logger.error("RAW capture failed: Picamera2 not available")
             raise RuntimeError("Picamera2 not available")
 
-        # Create a RAW configuration for the capture
-        logger.info("Creating RAW configuration for capture...")
+        # RAW configuration is built once (see initialize) and reused here
         raw_config = self._create_raw_config()
         
         # Check if we actually got RAW or fallback RGB
@@ -673,208 +1554,366 @@ class IMX477Camera:
         # Capture data and metadata using switch_mode
         raw_arr = None
         meta = None
-        capture_success = False
         
         try:
-            logger.info("Using switch_mode_and_capture_array for RAW capture...")
-            
-            # This method temporarily switches to RAW mode, captures, and switches back
-            # It's designed exactly for this use case!
-            request = self.picam.switch_mode_and_capture_array(raw_config)
-            raw_arr = request
-            
-            # Try to get metadata if available
-            try:
-                meta = self.picam.capture_metadata()
-            except:
-                meta = {}
-            
-            if raw_arr is not None:
-                logger.info("RAW capture successful: array shape=%s, dtype=%s", 
-                           raw_arr.shape, raw_arr.dtype)
-                capture_success = True
-            else:
-                logger.warning("switch_mode_and_capture_array returned None")
-                
-        except AttributeError:
-            # switch_mode_and_capture_array not available, try alternative
-            logger.warning("switch_mode_and_capture_array not available, trying manual stop/start method")
+            logger.info("Using switch_mode_and_capture_request for RAW capture...")
             
+            # Switches to RAW in-pipeline for one request and back, without a
+            # stop/configure/start round-trip; the request carries both the raw
+            # stream and the metadata of that very frame
+            with self._capture_loop_paused():
+                request = self.picam.switch_mode_and_capture_request(raw_config)
             try:
-                # Stop preview
-                logger.debug("Stopping camera for RAW capture...")
-                self.picam.stop()
-                
-                # Configure for RAW
-                logger.debug("Configuring for RAW...")
-                self.picam.configure(raw_config)
-                
-                # Start in RAW mode
-                logger.debug("Starting camera in RAW mode...")
-                self.picam.start()
-                
-                # Apply manual controls before capture to ensure settings are active
-                logger.debug("Applying manual controls for RAW capture...")
-                self.apply_manual_controls()
-                
-                # Capture
-                logger.debug("Capturing RAW array...")
-                request = self.picam.capture_request()
-                raw_arr = request.make_array()
+                raw_arr = self._raw_stream_array(request, raw_config, use_ring=True)
                 meta = request.get_metadata()
+            finally:
                 request.release()
-                
-                if raw_arr is not None:
-                    logger.info("RAW capture successful: array shape=%s, dtype=%s", 
-                               raw_arr.shape, raw_arr.dtype)
-                    capture_success = True
-                
-                # Restart in preview mode
-                logger.debug("Restarting in preview mode...")
-                self.picam.stop()
-                preview_config = self._create_preview_config()
-                self.picam.configure(preview_config)
-                self.picam.start()
-                # Reapply manual controls after restoring preview mode
-                logger.debug("Reapplying manual controls after preview restore...")
-                self.apply_manual_controls()
-                logger.info("Camera restored to preview mode with manual controls")
-                
-            except Exception as e:
-                logger.error("Manual RAW capture failed: %s", e, exc_info=True)
-                
-                # Try to restore preview mode
-                try:
-                    logger.info("Attempting to restore preview mode after error...")
-                    self.picam.stop()
-                    preview_config = self._create_preview_config()
-                    self.picam.configure(preview_config)
-                    self.picam.start()
-                    # Reapply manual controls after error recovery
-                    self.apply_manual_controls()
-                    logger.info("Preview mode restored with manual controls")
-                except Exception as restore_error:
-                    logger.error("Failed to restore preview mode: %s", restore_error)
-                    
+
+            logger.info("RAW capture successful: array shape=%s, dtype=%s", 
+                       raw_arr.shape, raw_arr.dtype)
         except Exception as e:
             logger.error("RAW capture failed: %s", e, exc_info=True)
 
-        dng_saved_path = None
         if raw_arr is not None:
             logger.debug("Processing captured raw array...")
-            bayer = self._normalize_bayer_to_uint16(raw_arr)
+            # Converted frames land in the Bayer ring instead of a fresh allocation
+            out = None
+            if np.asarray(raw_arr).dtype != np.uint16:
+                out = self._acquire_bayer_buffer(np.shape(raw_arr))
+            bayer = self._normalize_bayer_to_uint16(raw_arr, out=out)
             logger.info("Raw array normalized to uint16: shape=%s", bayer.shape if bayer is not None else "None")
 
+            dng_future = None
             if save_dng:
-                logger.debug("Attempting to save raw data to file...")
-                try:
-                    if dng_path is None:
-                        dng_path = os.path.join(tempfile.gettempdir(), "capture_{}.tiff".format(os.getpid()))
-                        logger.debug("No path specified, using temporary path: %s", dng_path)
-                    else:
-                        # Ensure parent directory exists
-                        parent_dir = os.path.dirname(dng_path)
-                        if parent_dir and not os.path.exists(parent_dir):
-                            logger.debug("Creating parent directory: %s", parent_dir)
-                            os.makedirs(parent_dir, exist_ok=True)
-                        logger.debug("Using specified path: %s", dng_path)
-
-                    if tifffile is not None:
-                        logger.debug("Saving with tifffile as 16-bit TIFF...")
-                        tifffile.imwrite(dng_path, bayer.astype(np.uint16))
-                        dng_saved_path = dng_path
-                        logger.info("✓ Saved RAW Bayer as 16-bit TIFF: %s (size: %d bytes)", 
-                                   dng_path, os.path.getsize(dng_path) if os.path.exists(dng_path) else 0)
-                    elif cv2 is not None:
-                        logger.warning("tifffile library not installed, using OpenCV to save as 16-bit PNG")
-                        # Use cv2 to save as 16-bit PNG instead
-                        png_path = dng_path.replace('.tiff', '.png') if dng_path.endswith('.tiff') else dng_path + '.png'
-                        cv2.imwrite(png_path, bayer.astype(np.uint16))
-                        dng_saved_path = png_path
-                        logger.info("✓ Saved RAW Bayer as 16-bit PNG: %s (size: %d bytes)", 
-                                   png_path, os.path.getsize(png_path) if os.path.exists(png_path) else 0)
-                    else:
-                        logger.error("Neither tifffile nor cv2 available, cannot save RAW data to image file")
-                        # Fall back to numpy array
-                        npy_path = dng_path.replace('.tiff', '.npy') if dng_path.endswith('.tiff') else dng_path + '.npy'
-                        np.save(npy_path, bayer)
-                        dng_saved_path = npy_path
-                        logger.warning("Saved raw array as .npy: %s (size: %d bytes)", 
-                                     npy_path, os.path.getsize(npy_path) if os.path.exists(npy_path) else 0)
-                except Exception as e:
-                    logger.error("Failed to save raw data to disk: %s", e, exc_info=True)
+                if dng_path is None:
+                    dng_path = os.path.join(tempfile.gettempdir(), "capture_{}.tiff".format(os.getpid()))
+                    logger.debug("No path specified, using temporary path: %s", dng_path)
+                # Disk write runs on the IO worker so the camera is free again immediately
+                dng_future = self._io_pool.submit(self._persist_bayer, bayer, dng_path)
+                slot = self._ring_slot_of(bayer)
+                if slot is not None:
+                    self._bayer_ring_pending[slot] = dng_future
             else:
                 logger.info("save_dng=False, skipping file save")
+                dng_path = None
 
-            result = {"bayer": bayer, "meta": meta, "dng_path": dng_saved_path}
-            logger.info("RAW capture complete: bayer=%s, meta_keys=%s, saved_to=%s", 
+            result = {"bayer": bayer, "meta": meta, "dng_path": dng_path, "dng_future": dng_future}
+            logger.info("RAW capture complete: bayer=%s, meta_keys=%s, saving_to=%s", 
                        "available" if bayer is not None else "None",
                        list(meta.keys()) if meta else "None",
-                       dng_saved_path)
+                       dng_path)
         else:
             logger.warning("Raw array is None, capture failed")
-            result = {"bayer": None, "meta": meta, "dng_path": None}
+            result = {"bayer": None, "meta": meta, "dng_path": None, "dng_future": None}
 
         return result
 
+    def capture_raw_burst(self, n: int, save: bool = False, save_dir: Optional[str] = None) -> list:
+        """Capture `n` RAW frames with a single switch into RAW mode and back.
+
+        capture_raw() pays a full mode switch per frame; a burst reconfigures
+        once, captures the frames back to back at readout speed, then restores
+        the previous configuration. Frames are kept in memory (each burst
+        frame owns its own array, the Bayer ring is not used) and, if `save`
+        is set, handed to the IO worker as burst_<pid>_<index>.tiff in
+        `save_dir` (default: the temp directory).
+
+        Returns a list of capture_raw()-style dicts ("bayer", "meta",
+        "dng_path", "dng_future"), one per frame.
+        """
+        if not self.picam:
+            raise RuntimeError("Picamera2 not available")
+        if n <= 0:
+            return []
+
+        raw_config = self._create_raw_config()
+        restore_config = self._current_config or self._create_preview_config()
+        if save and save_dir is None:
+            save_dir = tempfile.gettempdir()
+
+        logger.info(f"Starting RAW burst of {n} frames (save={save})")
+        results = []
+        with self._capture_loop_paused():
+            try:
+                self.picam.stop()
+                self.picam.configure(raw_config)
+                self.picam.start()
+                self.apply_manual_controls()
+
+                for i in range(n):
+                    request = self.picam.capture_request()
+                    try:
+                        raw_arr = self._raw_stream_array(request, raw_config)
+                        meta = request.get_metadata()
+                    finally:
+                        request.release()
+
+                    bayer = self._normalize_bayer_to_uint16(raw_arr)
+                    path = dng_future = None
+                    if save:
+                        path = os.path.join(save_dir, f"burst_{os.getpid()}_{i:03d}.tiff")
+                        dng_future = self._io_pool.submit(self._persist_bayer, bayer, path)
+                    results.append(
+                        {"bayer": bayer, "meta": meta, "dng_path": path, "dng_future": dng_future}
+                    )
+            except Exception as e:
+                logger.error(f"RAW burst failed after {len(results)} of {n} frames: {e}")
+            finally:
+                try:
+                    self.picam.stop()
+                    self.picam.configure(restore_config)
+                    self.picam.start()
+                    self.apply_manual_controls()
+                except Exception as restore_error:
+                    logger.error(f"Failed to restore configuration after RAW burst: {restore_error}")
+
+        logger.info(f"RAW burst complete: {len(results)}/{n} frames")
+        return results
+
+    def _raw_stream_array(self, request: Any, raw_config: Any, use_ring: bool = False) -> np.ndarray:
+        """Return the "raw" stream of a request as a (height, width) array.
+
+        Picamera2 exposes unpacked 10/12-bit Bayer data as uint8 rows of
+        `stride` bytes; view those as uint16 and trim the row padding.
+        Packed (CSI2P / compressed) formats are returned unchanged.
+
+        When MappedArray is available the unpacked data is copied once,
+        straight out of the mapped DMA buffer into its destination (a Bayer
+        ring slot if `use_ring`, else a new array), instead of make_array()
+        copying the padded buffer first.
+        """
+        try:
+            raw_stream = raw_config["raw"]
+            width = tuple(raw_stream["size"])[0]
+            fmt = str(raw_stream["format"])
+        except Exception:
+            return request.make_array("raw")
+
+        name = _sensor_format_name(fmt)
+        unpacked16 = name == fmt and not name.endswith("8")
+
+        if MappedArray is not None and unpacked16:
+            with MappedArray(request, "raw") as mapped:
+                src = mapped.array
+                if src.dtype == np.uint8 and src.ndim == 2:
+                    src = src.view(np.uint16)[:, :width]
+                if src.dtype == np.uint16:
+                    if use_ring:
+                        dest = self._acquire_bayer_buffer(src.shape)
+                    else:
+                        dest = np.empty(src.shape, dtype=np.uint16)
+                    np.copyto(dest, src)
+                    return dest
+                return np.array(src)
+
+        arr = request.make_array("raw")
+        if arr.dtype == np.uint8 and arr.ndim == 2 and unpacked16:
+            arr = arr.view(np.uint16)[:, :width]
+        return arr
+
+    def _ring_slot_of(self, arr: np.ndarray) -> Optional[int]:
+        """Index of the Bayer ring slot `arr` is, or None if it is not a ring buffer."""
+        for idx, buf in enumerate(self._bayer_ring):
+            if buf is not None and arr is buf:
+                return idx
+        return None
+
+    def _write_tiff(self, path: str, bayer: np.ndarray) -> None:
+        """Write a tiled, zstd-compressed TIFF; uncompressed if no codec is available.
+
+        zstd needs the optional imagecodecs package. Once it is found missing,
+        later captures skip straight to the uncompressed tiled write.
+        """
+        tifffile = _optional_import("tifffile")
+        kwargs = {"photometric": "minisblack", "tile": (512, 512)}
+        if self._tiff_compression is not None:
+            try:
+                tifffile.imwrite(path, bayer, compression=self._tiff_compression, **kwargs)
+                return
+            except ValueError as e:
+                logger.warning(f"TIFF compression {self._tiff_compression} unavailable ({e}), writing uncompressed")
+                self._tiff_compression = None
+        tifffile.imwrite(path, bayer, **kwargs)
+
+    def _persist_bayer(self, bayer: np.ndarray, dng_path: str) -> Optional[str]:
+        """Write a Bayer array to disk; runs on the IO worker thread.
+
+        Returns the path actually written (the extension changes when falling
+        back to PNG or .npy), or None if saving failed.
+        """
+        logger.debug("Attempting to save raw data to file...")
+        # Normalized captures are already uint16; only cast (and copy) otherwise
+        if bayer.dtype != np.uint16:
+            bayer = bayer.astype(np.uint16)
+        tifffile = _optional_import("tifffile")
+        cv2 = _optional_import("cv2") if tifffile is None else None
+        try:
+            # Ensure parent directory exists
+            parent_dir = os.path.dirname(dng_path)
+            if parent_dir and not os.path.exists(parent_dir):
+                logger.debug("Creating parent directory: %s", parent_dir)
+                os.makedirs(parent_dir, exist_ok=True)
+
+            if tifffile is not None:
+                logger.debug("Saving with tifffile as 16-bit TIFF...")
+                self._write_tiff(dng_path, bayer)
+                logger.info("✓ Saved RAW Bayer as 16-bit TIFF: %s (size: %d bytes)", 
+                           dng_path, os.path.getsize(dng_path) if os.path.exists(dng_path) else 0)
+                return dng_path
+            elif cv2 is not None:
+                logger.warning("tifffile library not installed, using OpenCV to save as 16-bit PNG")
+                # Use cv2 to save as 16-bit PNG instead
+                png_path = str(Path(dng_path).with_suffix('.png'))
+                cv2.imwrite(png_path, bayer)
+                logger.info("✓ Saved RAW Bayer as 16-bit PNG: %s (size: %d bytes)", 
+                           png_path, os.path.getsize(png_path) if os.path.exists(png_path) else 0)
+                return png_path
+            else:
+                logger.error("Neither tifffile nor cv2 available, cannot save RAW data to image file")
+                # Fall back to numpy array
+                npy_path = str(Path(dng_path).with_suffix('.npy'))
+                np.save(npy_path, bayer)
+                logger.warning("Saved raw array as .npy: %s (size: %d bytes)", 
+                             npy_path, os.path.getsize(npy_path) if os.path.exists(npy_path) else 0)
+                return npy_path
+        except Exception as e:
+            logger.error("Failed to save raw data to disk: %s", e, exc_info=True)
+            return None
+
     # -------------------- Utilities --------------------
 
-    def _normalize_bayer_to_uint16(self, arr: np.ndarray) -> np.ndarray:
+    def _normalize_bayer_to_uint16(self, arr: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
         """Normalize various Bayer array dtypes to uint16.
 
         Many raw Bayer outputs are 10-12 bit packed into 16-bit containers or
         sometimes 8-bit. This function attempts to standardize to uint16.
+
+        When a conversion is needed and `out` (a uint16 array of the same
+        shape) is given, the result is written into it instead of a new array.
+        uint16 input is returned unchanged and `out` is left untouched.
         """
         if arr is None:
             logger.warning("_normalize_bayer_to_uint16 received None array")
             return None
 
-        arr = np.array(arr)
-        logger.debug("Normalizing Bayer array: shape=%s, dtype=%s, min=%s, max=%s", 
-                    arr.shape, arr.dtype, arr.min(), arr.max())
-        
+        arr = np.asarray(arr)
+
         if arr.dtype == np.uint16:
-            # assume already fine
+            # assume already fine; avoid touching pixel data on the common RAW path
             logger.debug("Array already uint16, no conversion needed")
             return arr
-        elif arr.dtype == np.uint8:
+
+        # min/max are full-frame scans, only evaluate them when DEBUG is emitted
+        logger.opt(lazy=True).debug(
+            "Normalizing Bayer array: shape={}, dtype={}, min={}, max={}",
+            lambda: arr.shape, lambda: arr.dtype, lambda: arr.min(), lambda: arr.max(),
+        )
+
+        if arr.dtype == np.uint8:
             # scale 8-bit to 16-bit
             logger.info("Converting uint8 to uint16 (bit shift left by 8)")
-            result = (arr.astype(np.uint16) << 8)
-            logger.debug("Conversion complete: new range [%d, %d]", result.min(), result.max())
-            return result
+            # The range of a shifted uint8 frame is known without scanning it
+            return self._shift_to_uint16(arr, 8, out)
         elif arr.dtype == np.float32 or arr.dtype == np.float64:
             # normalize float to 16-bit
             logger.info("Converting float to uint16 (normalizing to [0, 65535])")
+            if self._raw_bit_depth:
+                # The sensor range is fixed by its bit depth: scale by a constant
+                # instead of scanning every frame for its own min/max
+                scale = 65535.0 / ((1 << self._raw_bit_depth) - 1)
+                scratch = np.multiply(arr, scale, dtype=np.float32)
+                np.rint(scratch, out=scratch)
+                np.clip(scratch, 0, 65535, out=scratch)
+                result = out if out is not None else np.empty(arr.shape, dtype=np.uint16)
+                np.copyto(result, scratch, casting="unsafe")
+                return result
+            if _normalize_float_kernel is not None and arr.ndim == 2 and arr.size:
+                # Fused min/max + scale: two passes over the frame instead of four
+                result = out if out is not None else np.empty(arr.shape, dtype=np.uint16)
+                if not _normalize_float_kernel(arr, result):
+                    logger.warning("Float array has constant value, returning zeros")
+                return result
             vmin = arr.min()
             vmax = arr.max()
             logger.debug("Float range: [%f, %f]", vmin, vmax)
             if vmax == vmin:
                 logger.warning("Float array has constant value, returning zeros")
-                return (arr * 0).astype(np.uint16)
-            norm = (arr - vmin) / (vmax - vmin)
-            result = (norm * 65535).astype(np.uint16)
-            logger.debug("Conversion complete: new range [%d, %d]", result.min(), result.max())
+                if out is None:
+                    return np.zeros(arr.shape, dtype=np.uint16)
+                out.fill(0)
+                return out
+            # Stream through one float32 scratch buffer instead of three temporaries
+            scale = 65535.0 / (float(vmax) - float(vmin))
+            scratch = np.empty(arr.shape, dtype=np.float32)
+            np.subtract(arr, vmin, out=scratch, casting="unsafe")
+            np.multiply(scratch, scale, out=scratch)
+            result = out if out is not None else np.empty(arr.shape, dtype=np.uint16)
+            np.copyto(result, scratch, casting="unsafe")
+            logger.opt(lazy=True).debug(
+                "Conversion complete: new range [{}, {}]", lambda: result.min(), lambda: result.max()
+            )
             return result
         else:
             # unknown type: cast and scale conservatively
             logger.warning("Unknown dtype %s, attempting conservative conversion", arr.dtype)
             try:
+                # Narrow integer types are bounded by their dtype; only scan the
+                # data when the container is wider than the values it may hold
+                if np.issubdtype(arr.dtype, np.integer) and np.iinfo(arr.dtype).max <= 255:
+                    return self._shift_to_uint16(arr, 8, out)
+                if arr.dtype == np.bool_:
+                    return self._shift_to_uint16(arr.view(np.uint8), 8, out)
+                if self._raw_bit_depth and np.issubdtype(arr.dtype, np.integer):
+                    # Known sensor bit depth: shift into the top of the 16-bit range
+                    return self._shift_to_uint16(arr, 16 - self._raw_bit_depth, out)
                 max_val = arr.max()
                 logger.debug("Array max value: %d", max_val)
                 if max_val <= 255:
                     logger.info("Max value <= 255, treating as 8-bit (shift left by 8)")
-                    return (arr.astype(np.uint16) << 8)
+                    return self._shift_to_uint16(arr, 8, out)
                 elif max_val <= 4095:
                     # 12-bit -> scale to 16-bit
                     logger.info("Max value <= 4095, treating as 12-bit (shift left by 4)")
-                    return (arr.astype(np.uint16) << 4)
+                    return self._shift_to_uint16(arr, 4, out)
                 else:
                     logger.info("Max value > 4095, direct cast to uint16")
-                    return arr.astype(np.uint16)
+                    return self._cast_to_uint16(arr, out)
             except Exception as e:
                 logger.error("Conversion failed, falling back to direct cast: %s", e)
-                return arr.astype(np.uint16)
+                return self._cast_to_uint16(arr, out)
+
+    @staticmethod
+    def _shift_to_uint16(arr: np.ndarray, bits: int, out: Optional[np.ndarray]) -> np.ndarray:
+        # Cast and shift in a single pass; dtype= forces the uint16 loop,
+        # otherwise a uint8 input would be shifted (and truncated) in uint8
+        return np.left_shift(arr, bits, out=out, dtype=np.uint16, casting="unsafe")
+
+    @staticmethod
+    def _cast_to_uint16(arr: np.ndarray, out: Optional[np.ndarray]) -> np.ndarray:
+        if out is None:
+            return arr.astype(np.uint16)
+        np.copyto(out, arr, casting="unsafe")
+        return out
+
+    def _acquire_bayer_buffer(self, shape: Tuple[int, ...]) -> np.ndarray:
+        """Return the next slot of the uint16 Bayer ring, sized for `shape`.
+
+        Slots alternate between captures. If the background writer is still
+        saving a previous capture from the slot, wait for it first.
+        """
+        self._bayer_ring_index = (self._bayer_ring_index + 1) % len(self._bayer_ring)
+        idx = self._bayer_ring_index
+
+        pending = self._bayer_ring_pending[idx]
+        if pending is not None:
+            pending.result()  # _persist_bayer logs its own errors and never raises
+            self._bayer_ring_pending[idx] = None
+
+        buf = self._bayer_ring[idx]
+        if buf is None or buf.shape != tuple(shape):
+            buf = np.empty(shape, dtype=np.uint16)
+            self._bayer_ring[idx] = buf
+        return buf
 
     # Small helper to test availability
     @staticmethod
@@ -1,7 +1,104 @@
+import copy
+import functools
+import logging
+import os
+import threading
 import yaml
 from pathlib import Path
 from transitions import Machine
 
+try:
+    # libyaml-backed loader, several times faster than the pure-Python one
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+logger = logging.getLogger("ScannerFSM")
+
+_DEFAULT_CONFIG_PATH = Path(__file__).parent / "states.yaml"
+
+
+def _load_fsm_config(path_str):
+    """Parse an FSM definition (ScannerFSM caches the result per path and mtime)."""
+    # One read of the whole (small) file; the C loader parses the bytes directly
+    return yaml.load(Path(path_str).read_bytes(), Loader=SafeLoader)
+
+
+def _memoized_condition(func):
+    """Cache a guard's result for the current FSM tick (see advance_tick)."""
+    name = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(self):
+        key = (name, self._tick)
+        try:
+            return self._cond_cache[key]
+        except KeyError:
+            result = self._cond_cache[key] = func(self)
+            return result
+
+    return wrapper
+
+
+def _legal_callback_names(states, transitions):
+    """Callback names the definition can dispatch to: on_enter_/on_exit_<state>,
+    on_<trigger>, plus any names referenced explicitly by the states."""
+    legal = set()
+    for state in states:
+        if isinstance(state, dict):
+            name = state.get("name")
+            for key in ("on_enter", "on_exit"):
+                refs = state.get(key) or []
+                legal.update([refs] if isinstance(refs, str) else refs)
+        else:
+            name = state
+        legal.add(f"on_enter_{name}")
+        legal.add(f"on_exit_{name}")
+    for transition in transitions:
+        legal.add(f"on_{transition['trigger']}")
+    return frozenset(legal)
+
+
+# add_model mutates the prototype's model list; serialize attach/detach
+_MACHINE_LOCK = threading.Lock()
+
+# (id(config), callback names) -> (config, machine, legal names, max_retries).
+# The config is kept in the entry so its id cannot be reused while cached.
+_PROTOTYPES = {}
+_MAX_PROTOTYPES = 8
+
+
+def _machine_prototype(fsm_config, callback_names):
+    """Build the state/transition graph once; instances attach via add_model.
+
+    transitions auto-registers model methods named on_enter_/on_exit_<state>
+    on the shared State objects, so the callback names are part of the key:
+    instances registering the same callbacks share one graph.
+    """
+    key = (id(fsm_config), callback_names)
+    with _MACHINE_LOCK:
+        entry = _PROTOTYPES.get(key)
+        if entry is None:
+            # Deep copy so nothing downstream can alter the caller's definition
+            definition = copy.deepcopy(fsm_config)
+            states = definition.get("states", [])
+            transitions = definition.get("transitions", [])
+            machine = Machine(
+                model=None,
+                states=states,
+                transitions=transitions,
+                initial=definition.get("initial", "idle"),
+                auto_transitions=False,
+                prepare_event="advance_tick",
+            )
+            legal = _legal_callback_names(states, transitions)
+            if len(_PROTOTYPES) >= _MAX_PROTOTYPES:
+                _PROTOTYPES.clear()  # attached instances keep their own reference
+            entry = _PROTOTYPES[key] = (
+                fsm_config, machine, legal, definition.get("max_retries", 3)
+            )
+    return entry[1:]
+
 
 class ScannerFSM:
     """
@@ -9,60 +106,109 @@ class ScannerFSM:
     Loads its structure from states.yml for easy modification.
     """
 
-    def __init__(self, config_path=None, callbacks=None):
+    # Fixed attributes live in slots. transitions still binds trigger and
+    # is_<state> helpers per instance, so a __dict__ is kept for those;
+    # callbacks are served from self.callbacks by __getattr__.
+    __slots__ = (
+        "__dict__",
+        "config_path",
+        "callbacks",
+        "machine",
+        "state",
+        "retry_count",
+        "max_retries",
+        "_tick",
+        "_cond_cache",
+    )
+
+    # Parsed definitions shared by all instances: path -> (mtime_ns, config)
+    _CONFIG_CACHE = {}
+    _CONFIG_LOCK = threading.Lock()
+
+    def __init__(self, config_path=None, callbacks=None, config=None):
         """
         :param config_path: Optional path to the YAML FSM definition.
         :param callbacks: Optional dict of callbacks for state entry actions.
                           Example: {"on_enter_capturing": some_function}
+        :param config: Optional preloaded FSM definition (the parsed YAML dict
+                       with "states", "transitions" and "initial"); when given,
+                       config_path is not read.
         """
-        self.config_path = config_path or Path(__file__).parent / "states.yaml"
+        self.config_path = config_path or _DEFAULT_CONFIG_PATH
         self.callbacks = callbacks or {}
+        # Guard results are cached per tick; the machine advances it per event
+        self._tick = 0
+        self._cond_cache = {}
 
-        with open(self.config_path, "r") as f:
-            fsm_config = yaml.safe_load(f)
-
-        states = fsm_config.get("states", [])
-        transitions = fsm_config.get("transitions", [])
-        initial = fsm_config.get("initial", "idle")
+        if config is None:
+            config = self._cached_config(self.config_path)
+        machine, legal, max_retries = _machine_prototype(config, frozenset(self.callbacks))
 
-        machine = Machine(
-            model=self,
-            states=states,
-            transitions=transitions,
-            initial=initial,
-            auto_transitions=False,
-        )
+        self.retry_count = 0
+        self.max_retries = max_retries
 
-        # Register and validate callbacks
+        # Validate callbacks; they are resolved through __getattr__
         for name, func in self.callbacks.items():
+            if name not in legal:
+                raise ValueError(
+                    f"Callback name '{name}' does not match any state or trigger "
+                    f"in {Path(self.config_path).name} (e.g., 'on_enter_capturing')"
+                )
             if not callable(func):
                 raise ValueError(f"Callback '{name}' must be callable, got {type(func)}")
-            if not name.startswith("on_"):
-                raise ValueError(f"Callback name '{name}' should start with 'on_' (e.g., 'on_enter_capturing')")
-            setattr(self, name, func)
 
+        # Shared graph: only the triggers and is_<state> helpers are bound here
+        with _MACHINE_LOCK:
+            machine.add_model(self)
         self.machine = machine
 
+    @classmethod
+    def from_config_path(cls, config_path, callbacks=None):
+        """Create an FSM from a YAML definition, parsed at most once per file change."""
+        return cls(config_path, callbacks, config=cls._cached_config(config_path))
+
+    @classmethod
+    def _cached_config(cls, config_path):
+        path = Path(config_path).resolve()
+        mtime_ns = os.stat(path).st_mtime_ns
+        with cls._CONFIG_LOCK:
+            cached = cls._CONFIG_CACHE.get(path)
+            if cached is None or cached[0] != mtime_ns:
+                # A changed mtime replaces the stale entry for this path
+                cached = (mtime_ns, _load_fsm_config(str(path)))
+                cls._CONFIG_CACHE[path] = cached
+        return cached[1]
+
+    def __getattr__(self, name):
+        # Only reached when normal lookup fails: serve registered callbacks
+        if name != "callbacks":
+            callbacks = self.callbacks
+            if name in callbacks:
+                return callbacks[name]
+        raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+
     # -------------------- Condition Methods --------------------
     # These methods are referenced in states.yaml as conditions for transitions
 
+    @_memoized_condition
     def is_retry_allowed(self):
         """Check if capture retry is allowed (e.g., max retries not exceeded)."""
-        max_retries = getattr(self, 'max_retries', 3)
-        current_retries = getattr(self, 'retry_count', 0)
-        return current_retries < max_retries
+        return self.retry_count < self.max_retries
 
+    @_memoized_condition
     def is_recoverable(self):
         """Check if error state is recoverable."""
         # Override this method to implement custom recovery logic
         return True
 
+    @_memoized_condition
     def is_camera_recoverable(self):
         """Check if camera error can be recovered."""
         # Implement camera-specific recovery checks
         # e.g., check if camera is still connected, try reinitialization
         return True
 
+    @_memoized_condition
     def is_motor_recoverable(self):
         """Check if motor error can be recovered."""
         # Implement motor-specific recovery checks
@@ -71,14 +217,31 @@ class ScannerFSM:
 
     # -------------------- Helper Methods --------------------
 
+    def advance_tick(self):
+        """Start a new tick: guard results cached during the previous one are dropped.
+
+        Called by the machine before every event; call it directly when
+        something a guard depends on changes outside of an event.
+        """
+        self._tick += 1
+        self._cond_cache.clear()
+
     def reset_retry_count(self):
         """Reset retry counter (call this when entering capturing state)."""
         self.retry_count = 0
+        self.advance_tick()
 
     def increment_retry_count(self):
         """Increment retry counter (call this when retrying capture)."""
-        self.retry_count = getattr(self, 'retry_count', 0) + 1
+        self.retry_count += 1
+        self.advance_tick()
+
+    def detach(self):
+        """Remove this instance from the shared machine so it can be collected."""
+        with _MACHINE_LOCK:
+            self.machine.remove_model(self)
 
     # Optional debugging helper
     def debug_state(self):
-        print(f"[FSM] Current state → {self.state}")
+        # %-style arguments: formatted only if DEBUG is enabled for this logger
+        logger.debug("[FSM] Current state → %s", self.state)
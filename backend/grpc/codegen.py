@@ -1,36 +1,106 @@
+import asyncio
+import hashlib
 import subprocess
+import sys
 from pathlib import Path
-import re
 
-def run():
-    proto_path = Path("backend/grpc/scanner.proto").resolve()
-    out_dir = Path("backend/grpc/generated").resolve()
-
-    out_dir.mkdir(exist_ok=True)
 
-    cmd = [
-        "python", "-m", "grpc_tools.protoc",
+def _protoc_args(proto_path, out_dir):
+    return [
         "-I", str(proto_path.parent),
         "--python_out", str(out_dir),
         "--grpc_python_out", str(out_dir),
         str(proto_path)
     ]
 
-    print("Running:", " ".join(cmd))
-    subprocess.run(cmd, check=True)
-
-    # Fix import in generated grpc file
-    grpc_file = out_dir / "scanner_pb2_grpc.py"
-    if grpc_file.exists():
-        content = grpc_file.read_text()
-        # Replace "import scanner_pb2" with "from . import scanner_pb2"
-        content = re.sub(
-            r'^import scanner_pb2 as',
-            'from . import scanner_pb2 as',
-            content,
-            flags=re.MULTILINE
-        )
-        grpc_file.write_text(content)
-        print("✔ Fixed import in scanner_pb2_grpc.py")
 
+async def _run_protoc_parallel(arg_lists):
+    # One protoc process per .proto file, all running concurrently
+    procs = []
+    for args in arg_lists:
+        cmd = [sys.executable, "-m", "grpc_tools.protoc", *args]
+        print("Running:", " ".join(cmd))
+        procs.append(await asyncio.create_subprocess_exec(*cmd))
+    codes = await asyncio.gather(*(proc.wait() for proc in procs))
+    for args, code in zip(arg_lists, codes):
+        if code != 0:
+            raise subprocess.CalledProcessError(code, args[-1])
+
+
+def _fix_grpc_import(grpc_file):
+    """Turn ``import <name>_pb2 as`` into a package-relative import."""
+    module = grpc_file.name[: -len("_grpc.py")].encode()
+    # Plain ASCII patch: work on bytes, no decode/encode round-trip
+    data = grpc_file.read_bytes()
+    relative = b"from . import " + module + b" as"
+    if relative in data:
+        return
+    # Replace "import <name>_pb2" with "from . import <name>_pb2" at line
+    # starts; the leading "\n" lets a match on the first line count too
+    fixed = (b"\n" + data).replace(b"\nimport " + module + b" as", b"\n" + relative)[1:]
+    if fixed != data:
+        grpc_file.write_bytes(fixed)
+        print(f"✔ Fixed import in {grpc_file.name}")
+
+
+def run(force=None):
+    proto_dir = Path("backend/grpc").resolve()
+    out_dir = Path("backend/grpc/generated").resolve()
+    hash_file = out_dir / ".proto_hash"
+
+    if force is None:
+        force = "--force" in sys.argv[1:]
+
+    out_dir.mkdir(exist_ok=True)
+
+    protos = sorted(proto_dir.glob("*.proto"))
+    if not protos:
+        raise FileNotFoundError(f"No .proto files found in {proto_dir}")
+
+    # Only regenerate when a .proto's content changed (or with --force);
+    # a content hash survives checkouts and copies that touch mtimes
+    digest = hashlib.blake2b(digest_size=16)
+    for proto_path in protos:
+        digest.update(proto_path.name.encode() + b"\0")
+        digest.update(proto_path.read_bytes())
+    proto_hash = digest.hexdigest()
+    outputs = [
+        out_dir / f"{p.stem}{suffix}" for p in protos for suffix in ("_pb2.py", "_pb2_grpc.py")
+    ]
+    if not force and all(p.exists() for p in outputs) and hash_file.exists():
+        if hash_file.read_text().strip() == proto_hash:
+            print("✔ Protobufs up-to-date at:", out_dir)
+            return
+
+    arg_lists = [_protoc_args(p, out_dir) for p in protos]
+
+    try:
+        # In-process: no second interpreter start-up or grpc_tools import
+        import grpc_tools
+        from grpc_tools import protoc
+    except ImportError:
+        protoc = None
+
+    if len(protos) > 1:
+        # protoc.main is not safe to run concurrently in one process:
+        # fan out to one protoc process per file instead
+        asyncio.run(_run_protoc_parallel(arg_lists))
+    elif protoc is not None:
+        # `python -m grpc_tools.protoc` adds the bundled well-known types itself
+        well_known = Path(grpc_tools.__file__).parent / "_proto"
+        print("Running: grpc_tools.protoc", " ".join(arg_lists[0]))
+        if protoc.main(["grpc_tools.protoc", *arg_lists[0], f"-I{well_known}"]) != 0:
+            raise RuntimeError("grpc_tools.protoc failed")
+    else:
+        cmd = [sys.executable, "-m", "grpc_tools.protoc", *arg_lists[0]]
+        print("Running:", " ".join(cmd))
+        subprocess.run(cmd, check=True)
+
+    # Fix imports in generated grpc files
+    for proto_path in protos:
+        grpc_file = out_dir / f"{proto_path.stem}_pb2_grpc.py"
+        if grpc_file.exists():
+            _fix_grpc_import(grpc_file)
+
+    hash_file.write_text(proto_hash + "\n")
     print("✔ Protobufs generated at:", out_dir)
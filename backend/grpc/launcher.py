@@ -178,6 +178,7 @@ def main() -> None:
     stop_event.wait()
 
     grpc_server.stop(grace=3)
+    controller.shutdown()
     if http_server is not None:
         http_server.shutdown()
     log.info("Bye.")
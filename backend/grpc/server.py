@@ -1,9 +1,13 @@
 # backend/grpc/server.py
+import asyncio
+import queue
+import threading
 import time
 import grpc
 import cv2
 import numpy as np
 import logging
+import os
 from concurrent import futures
 from pathlib import Path
 from typing import Iterator
@@ -19,6 +23,14 @@ logger = logging.getLogger("GRPCServer")
 try:
     from backend.grpc.generated import scanner_pb2, scanner_pb2_grpc
     logger.info("✓ Protobuf modules loaded successfully")
+    # Message (de)serialization cost depends on the runtime: "upb" (default
+    # since protobuf 4.21) and "cpp" are native, "python" is several times slower
+    from google.protobuf.internal import api_implementation
+    if api_implementation.Type() == "python":
+        logger.warning("Pure-Python protobuf runtime in use; install a protobuf wheel "
+                       "with the upb backend for faster message handling")
+    else:
+        logger.info(f"Protobuf runtime: {api_implementation.Type()}")
 except ImportError as e:
     logger.error(f"Failed to import protobuf modules: {e}")
     logger.error("Run: poetry run generate-protos")
@@ -38,16 +50,93 @@ except Exception:
 # Setup logging
 logger = logging.getLogger("GRPCServer")
 
+# libjpeg-turbo for preview encoding (SIMD DCT/Huffman, takes RGB directly);
+# cv2.imencode is used when it is not installed
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR, TJPF_RGB, TJPF_GRAY, TJSAMP_420, TJSAMP_422, TJSAMP_GRAY
+    _TJ = TurboJPEG()  # one shared handle, safe to use from several threads
+except Exception as e:
+    logger.info(f"PyTurboJPEG not available, preview uses cv2.imencode: {e}")
+    _TJ = None
+
+# uvloop is a faster drop-in event loop for the aio server; optional
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+def _new_event_loop():
+    return uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+
+
+# Channel args for the aio server
+_SERVER_OPTIONS = [
+    # Stated explicitly (gRPC core already defaults to it on Linux): several
+    # server processes may bind the same port and the kernel spreads
+    # incoming connections across them
+    ("grpc.so_reuseport", 1),
+    # Preview and status streams are long-lived; do not cap them per connection
+    ("grpc.max_concurrent_streams", 1024),
+    # Idle streams may go a long time without data; allow pings regardless
+    ("grpc.http2.max_pings_without_data", 0),
+    # Let BDP probing grow the flow-control window, so a preview stream over
+    # high-latency WiFi is not stalled on WINDOW_UPDATE round trips per frame
+    ("grpc.http2.bdp_probe", 1),
+    ("grpc.http2.max_frame_size", 16777215),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_permit_without_calls", 1),
+    # Full-resolution frames and JPEGs must not hit the 4 MB default limit
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+]
+
+# Sentinel returned by next() when a blocking stream generator is exhausted
+_STREAM_END = object()
+
 # Helper to save NumPy image as PNG
 def _save_frame_as_png(frame: np.ndarray, out_dir: Path, prefix: str = "frame") -> str:
+    """Save `frame` as PNG and return its path.
+
+    The file is written under a temporary name and renamed, so it appears
+    under the returned name only once complete.
+    """
     out_dir.mkdir(parents=True, exist_ok=True)
-    ts = int(time.time() * 1000)
+    ts = time.time_ns() // 1_000_000
     path = out_dir / f"{prefix}_{ts}.png"
-    # Convert BGR (OpenCV) to RGB for correct colors if needed; cv2.imwrite expects BGR, so keep as-is.
-    cv2.imwrite(str(path), frame)
+    # cv2 expects BGR, which is what the camera delivers: no conversion
+    return _write_png_atomic(frame, path)
+
+
+def _write_png_atomic(frame: np.ndarray, path: Path) -> str:
+    ok, buffer = cv2.imencode(".png", frame)
+    if not ok:
+        raise RuntimeError(f"PNG encoding failed for {path}")
+    # Write under a temporary name so readers never see a partial file
+    tmp = path.with_name(f".{path.name}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(buffer)
+    os.replace(tmp, path)
     return str(path)
 
 
+# Upper bound for a single full-resolution capture (mode switch + readout)
+_CAPTURE_TIMEOUT = 5.0
+# Upper bound for PNG-encoding and writing one full-resolution frame
+_SAVE_TIMEOUT = 30.0
+
+# CameraControls field -> camera control name (ColourGains is built from r_gain/b_gain)
+_TYPED_CONTROL_FIELDS = (
+    ("ae_enable", "AeEnable"),
+    ("exposure_time", "ExposureTime"),
+    ("awb_enable", "AwbEnable"),
+    ("brightness", "Brightness"),
+    ("contrast", "Contrast"),
+    ("sharpness", "Sharpness"),
+    ("saturation", "Saturation"),
+)
+
+
 class ScannerServiceImpl:
     """
     Implementation wrapper that will be adapted to the generated servicer class below.
@@ -57,6 +146,62 @@ class ScannerServiceImpl:
     def __init__(self, controller: PipelineController):
         self.controller = controller
         self.logger = logging.getLogger("ScannerServiceImpl")
+        self._tj = _TJ
+        # Channel order of camera preview frames, read once (RGB if the camera does not say)
+        self._preview_is_bgr = getattr(
+            getattr(controller, "camera", None), "preview_format", "RGB"
+        ) in ("BGR", "BGR888", "XBGR8888")
+        # PNG encoding of full-resolution captures runs here, off the RPC path
+        self._io_pool = futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="grpc-png")
+
+    def close(self):
+        """Release the PNG encoding threads, finishing writes already queued."""
+        self._io_pool.shutdown(wait=True)
+
+    def _encode_preview_jpeg(self, frame: np.ndarray, quality: int, dst: bytearray = None):
+        """JPEG-encode a colour (RGB or BGR, see preview_format) or grayscale
+        preview frame; None on failure.
+
+        With libjpeg-turbo the JPEG is written into `dst`, a scratch buffer the
+        caller reuses for every frame of a stream (grown here when too small),
+        so the only per-frame allocation is the returned bytes object.
+        """
+        if self._tj is not None:
+            if frame.ndim == 3 and frame.shape[2] == 3:
+                # 4:2:2 halves chroma for the preview without visible loss
+                pixel_format = TJPF_BGR if self._preview_is_bgr else TJPF_RGB
+                subsample = TJSAMP_422
+            elif frame.ndim == 2:
+                pixel_format, subsample = TJPF_GRAY, TJSAMP_GRAY
+            else:
+                pixel_format = None
+            if pixel_format is not None:
+                if dst is None:
+                    return self._tj.encode(
+                        frame, quality=quality, pixel_format=pixel_format,
+                        jpeg_subsample=subsample
+                    )
+                needed = self._tj.buffer_size(frame, subsample)
+                if len(dst) < needed:
+                    dst.extend(bytes(needed - len(dst)))
+                _, nbytes = self._tj.encode(
+                    frame, quality=quality, pixel_format=pixel_format,
+                    jpeg_subsample=subsample, dst=dst
+                )
+                with memoryview(dst) as view:
+                    return bytes(view[:nbytes])
+
+        # OpenCV expects BGR, convert from RGB if needed
+        if len(frame.shape) == 3 and frame.shape[2] == 3 and not self._preview_is_bgr:
+            frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
+        else:
+            frame_bgr = frame
+
+        encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
+        success, buffer = cv2.imencode('.jpg', frame_bgr, encode_param)
+        if not success:
+            return None
+        return buffer.tobytes()
 
     def StartCapture(self, request):
         """Start the FSM-driven full capture pipeline (non-blocking; FSM runs callbacks)."""
@@ -113,18 +258,21 @@ class ScannerServiceImpl:
                 # Generate path in output directory (same as RGB captures)
                 # Use .tiff extension (will be converted to .png if tifffile not available)
                 self.controller.output_dir.mkdir(parents=True, exist_ok=True)
-                ts = int(time.time() * 1000)
+                ts = time.time_ns() // 1_000_000
                 raw_path = self.controller.output_dir / f"capture_raw_{ts}.tiff"
                 self.logger.info(f"RAW will be saved to: {raw_path} (or .png if tifffile not available)")
                 
                 result = self.controller.camera.capture_raw(save_dng=True, dng_path=str(raw_path))
+                # The camera is already back in preview; only this RPC waits for the disk write
+                dng_future = result.get('dng_future')
+                dng_path = dng_future.result() if dng_future is not None else None
                 
                 self.logger.debug("RAW capture result: bayer=%s, meta=%s, dng_path=%s",
                                  "available" if result.get('bayer') is not None else "None",
                                  "available" if result.get('meta') is not None else "None",
-                                 result.get('dng_path'))
+                                 dng_path)
                 
-                if result['dng_path'] is None:
+                if dng_path is None:
                     self.logger.error("RAW capture failed: dng_path is None")
                     # Check if raw_arr was captured but save failed
                     if result.get('bayer') is not None:
@@ -133,20 +281,25 @@ class ScannerServiceImpl:
                         self.logger.error("Camera capture itself failed, no raw data available")
                     return False, "", "RAW capture failed - no file saved"
                 
-                abs_path = str(Path(result['dng_path']).resolve())
+                abs_path = str(Path(dng_path).resolve())
                 self.logger.info(f"✓ RAW frame captured successfully: {abs_path}")
                 return True, abs_path, "RAW frame captured"
             else:
                 # Capture preview frame
                 self.logger.info("Starting RGB frame capture...")
-                frame = self.controller.camera.capture_frame()
+                # Runs on the controller's camera thread, serialized with FSM captures
+                frame = self.controller.capture_frame_async().result(timeout=_CAPTURE_TIMEOUT)
                 
                 if frame is None:
                     self.logger.error("RGB capture failed: camera returned None")
                     return False, "", "No frame captured"
                 
                 self.logger.debug("Frame captured: shape=%s, dtype=%s", frame.shape, frame.dtype)
-                out_path = _save_frame_as_png(frame, self.controller.output_dir, prefix="capture")
+                # zlib-heavy encode on the bounded writer pool; waited for, so the
+                # returned path exists and a failed write reaches the client
+                out_path = self._io_pool.submit(
+                    _save_frame_as_png, frame, self.controller.output_dir, "capture"
+                ).result(timeout=_SAVE_TIMEOUT)
                 abs_path = str(Path(out_path).resolve())
                 self.logger.info(f"✓ RGB frame saved to: {abs_path}")
                 return True, abs_path, "Frame captured"
@@ -183,70 +336,204 @@ class ScannerServiceImpl:
             self.logger.error(f"Shutdown failed: {e}")
             return False, f"Shutdown failed: {e}"
 
-    def StreamPreview(self, request) -> Iterator:
+    def StreamStatus(self, request, stop: threading.Event = None) -> Iterator:
+        """
+        Yield (state, frame_count) now and again on every status change,
+        or after 0.5 s without one as a heartbeat. Ends once `stop` is set.
+        """
+        stop = stop or threading.Event()
+        controller = self.controller
+        while not stop.is_set():
+            seq = controller.status_seq
+            yield controller.current_state(), len(controller.frames)
+            controller.wait_for_status_change(seq, timeout=0.5)
+
+    def StreamStatusBatched(self, request, stop: threading.Event = None, max_batch: int = 16,
+                            max_delay: float = 0.5) -> Iterator:
+        """
+        Yield batches of (state, frame_count) status changes, oldest first.
+
+        A batch is flushed as soon as the FSM state changes, once it holds
+        max_batch updates, or max_delay seconds after its first update, so
+        bursts of frame-count changes share one message. Waits on the
+        controller's change notification instead of polling. Ends once
+        `stop` is set.
+        """
+        stop = stop or threading.Event()
+        pending = []
+        first_pending_at = 0.0
+        last_update = None
+        last_sent_state = None
+        
+        while not stop.is_set():
+            seq = self.controller.status_seq
+            state = self.controller.current_state()
+            update = (state, len(self.controller.frames))
+            if update != last_update:
+                last_update = update
+                if not pending:
+                    first_pending_at = time.monotonic()
+                pending.append(update)
+            
+            if pending and (
+                state != last_sent_state
+                or len(pending) >= max_batch
+                or time.monotonic() - first_pending_at >= max_delay
+            ):
+                yield pending
+                last_sent_state = state
+                pending = []
+            
+            timeout = max_delay
+            if pending:
+                timeout = max(0.0, first_pending_at + max_delay - time.monotonic())
+            self.controller.wait_for_status_change(seq, timeout=timeout)
+
+    def StreamPreview(self, request, stop: threading.Event = None) -> Iterator:
         """
         Stream live preview frames as JPEG encoded data.
         Only works when scanner is in idle state.
-        Yields PreviewFrame messages until client disconnects.
+        Yields PreviewFrame messages until client disconnects (or `stop` is set).
+
+        Capture and encoding run on a per-stream producer thread feeding a
+        small queue, so encoding the next frame overlaps sending this one.
+        Frames are never sent late: the producer skips its pacing sleep once
+        encoding used up the frame interval, and each send takes the newest
+        queued frame, dropping any older one.
         """
         try:
             fps = request.fps if request.fps > 0 else 10
             quality = request.quality if 1 <= request.quality <= 100 else 75
             frame_interval = 1.0 / fps
             
-            self.logger.info(f"StreamPreview started (fps={fps}, quality={quality})")
+            self.logger.info("StreamPreview started (fps=%s, quality=%s)", fps, quality)
             
-            while True:
-                start_time = time.time()
-                
-                # Only stream if in idle state
-                current_state = self.controller.current_state()
-                if current_state != 'idle':
-                    self.logger.debug(f"Preview streaming paused - state: {current_state}")
-                    time.sleep(0.5)
-                    continue
-                
+            frames = queue.Queue(maxsize=2)
+            stop = stop or threading.Event()
+            producer = threading.Thread(
+                target=self._produce_preview_frames,
+                args=(quality, frame_interval, frames, stop),
+                name="preview-encoder",
+                daemon=True,
+            )
+            producer.start()
+            try:
+                while not stop.is_set():
+                    try:
+                        item = frames.get(timeout=0.5)
+                    except queue.Empty:
+                        if not producer.is_alive():
+                            return
+                        continue
+                    # Send only the newest frame; anything queued behind it is stale
+                    while True:
+                        try:
+                            item = frames.get_nowait()
+                        except queue.Empty:
+                            break
+                    yield item
+            finally:
+                # Client went away (generator closed) or the stream failed
+                stop.set()
+                    
+        except Exception as e:
+            self.logger.error("StreamPreview error: %s", e)
+            return
+
+    def _produce_preview_frames(self, quality: int, frame_interval: float,
+                                frames: "queue.Queue", stop: threading.Event):
+        """Capture and encode preview frames for one stream until `stop` is set."""
+        # Per-stream JPEG scratch buffer; concurrent streams each get their own
+        jpeg_buf = bytearray()
+        # This stream's cursor into the camera's encoded-frame sink
+        jpeg_seq = 0
+        # Pacing uses integer monotonic nanoseconds: immune to clock steps, no float drift
+        interval_ns = int(frame_interval * 1e9)
+        # Level checked once per stream, not once per frame
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        
+        while not stop.is_set():
+            start_ns = time.monotonic_ns()
+            
+            # Only stream if in idle state
+            current_state = self.controller.current_state()
+            if current_state != 'idle':
+                # Runs on every state change while paused: skip the call unless DEBUG is on
+                if debug_enabled:
+                    self.logger.debug("Preview streaming paused - state: %s", current_state)
+                # Woken by the next state change; bounded so `stop` is still seen
+                self.controller.wait_for_status_change(self.controller.status_seq, timeout=0.5)
+                continue
+            
+            camera = self.controller.camera
+            
+            # Best case: the camera's own (hardware) JPEG encoder already did the work
+            encoded = None
+            if hasattr(camera, "get_preview_jpeg"):
+                encoded = camera.get_preview_jpeg(quality=quality, seq=jpeg_seq)
+            if encoded is not None:
+                jpeg_data, width, height, jpeg_seq = encoded
+                self._offer_preview_frame(
+                    frames, (jpeg_data, width, height, time.time_ns() // 1_000_000)
+                )
+                remaining_ns = interval_ns - (time.monotonic_ns() - start_ns)
+                if remaining_ns > 0:
+                    stop.wait(remaining_ns / 1e9)
+                continue
+            
+            # Prefer the ISP-scaled YUV420 lores frame: libjpeg-turbo encodes
+            # it directly, with no colour conversion on the CPU
+            yuv = None
+            if self._tj is not None and hasattr(camera, "get_preview_yuv_frame"):
+                yuv = camera.get_preview_yuv_frame()
+            
+            if yuv is not None:
+                frame, width, height = yuv
+            else:
                 # Get frame from camera
-                frame = self.controller.camera.get_preview_stream_frame()
+                frame = camera.get_preview_stream_frame()
                 
                 if frame is None:
-                    time.sleep(0.1)
+                    stop.wait(0.1)
                     continue
+                height, width = frame.shape[:2]
+            
+            # Encode as JPEG
+            try:
+                if yuv is not None:
+                    jpeg_data = self._tj.encode_from_yuv(
+                        frame, height, width, quality=quality, jpeg_subsample=TJSAMP_420
+                    )
+                else:
+                    jpeg_data = self._encode_preview_jpeg(frame, quality, jpeg_buf)
                 
-                # Encode as JPEG
-                try:
-                    # OpenCV expects BGR, convert from RGB if needed
-                    if len(frame.shape) == 3 and frame.shape[2] == 3:
-                        frame_bgr = cv2.cvtColor(frame, cv2.COLOR_RGB2BGR)
-                    else:
-                        frame_bgr = frame
-                    
-                    encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), quality]
-                    success, buffer = cv2.imencode('.jpg', frame_bgr, encode_param)
-                    
-                    if not success:
-                        self.logger.warning("Failed to encode frame as JPEG")
-                        continue
-                    
-                    jpeg_data = buffer.tobytes()
-                    height, width = frame.shape[:2]
-                    timestamp = int(time.time() * 1000)
-                    
-                    yield jpeg_data, width, height, timestamp
-                    
-                except Exception as e:
-                    self.logger.error(f"Frame encoding error: {e}")
+                if jpeg_data is None:
+                    self.logger.warning("Failed to encode frame as JPEG")
                     continue
                 
-                # Rate limiting
-                elapsed = time.time() - start_time
-                sleep_time = max(0, frame_interval - elapsed)
-                if sleep_time > 0:
-                    time.sleep(sleep_time)
-                    
-        except Exception as e:
-            self.logger.error(f"StreamPreview error: {e}")
-            return
+                timestamp = time.time_ns() // 1_000_000
+            except Exception as e:
+                self.logger.error("Frame encoding error: %s", e)
+                continue
+            
+            self._offer_preview_frame(frames, (jpeg_data, width, height, timestamp))
+            
+            # Rate limiting
+            remaining_ns = interval_ns - (time.monotonic_ns() - start_ns)
+            if remaining_ns > 0:
+                stop.wait(remaining_ns / 1e9)
+
+    @staticmethod
+    def _offer_preview_frame(frames: "queue.Queue", item):
+        try:
+            frames.put_nowait(item)
+        except queue.Full:
+            # Consumer is behind: replace the oldest frame with this one
+            try:
+                frames.get_nowait()
+            except queue.Empty:
+                pass
+            frames.put_nowait(item)
 
     def MoveMotor(self, request):
         """
@@ -375,7 +662,6 @@ class ScannerServiceImpl:
         """Create a new custom camera preset."""
         try:
             preset_name = request.preset_name
-            controls_str = dict(request.controls)
             
             self.logger.info(f"CreateCameraPreset called: {preset_name}")
             
@@ -384,7 +670,23 @@ class ScannerServiceImpl:
             if current_state != 'idle':
                 return False, f"Cannot create preset in state: {current_state}. Must be in idle state."
             
-            # Parse controls from string format
+            if request.HasField("typed_controls"):
+                # Typed fields arrive already parsed by the protobuf runtime
+                typed = request.typed_controls
+                controls = {
+                    key: getattr(typed, field)
+                    for field, key in _TYPED_CONTROL_FIELDS
+                    if typed.HasField(field)
+                }
+                if typed.HasField("r_gain") and typed.HasField("b_gain"):
+                    controls["ColourGains"] = (typed.r_gain, typed.b_gain)
+                success = self.controller.camera.create_custom_preset(preset_name, controls)
+                if success:
+                    return True, f"Preset '{preset_name}' created successfully"
+                return False, f"Failed to create preset '{preset_name}'"
+            
+            # Legacy: parse controls from string format
+            controls_str = dict(request.controls)
             controls = {}
             for key, value_str in controls_str.items():
                 # Parse different types
@@ -444,135 +746,225 @@ class ScannerServiceImpl:
 # If generated gRPC classes exist, map them to service implementation
 if scanner_pb2 is not None and scanner_pb2_grpc is not None:
 
-    class GRPCServer:
-        def __init__(self, controller: PipelineController, host: str = "[::]", port: int = 50051):
-            self.controller = controller
-            self.host = host
-            self.port = port
-            self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=6))
-            self._impl = ScannerServiceImpl(controller)
+    class Servicer(scanner_pb2_grpc.ScannerServiceServicer):
+        """Async servicer mapping proto RPCs onto a ScannerServiceImpl.
+
+        Blocking implementation calls run on `blocking_pool`, off the event loop.
+        """
+
+        def __init__(self, impl: ScannerServiceImpl, blocking_pool: futures.Executor):
+            self._impl = impl
+            self._blocking_pool = blocking_pool
+
+        # Implement methods matching proto
+        async def StartCapture(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.StartCapture, request)
+            return scanner_pb2.CaptureResponse(success=ok, message=msg)
+
+        async def GetStatus(self, request, context):
+            ok, state, msg, frame_count = await self._run_blocking(
+                self._impl.GetStatus, request
+            )
+            return scanner_pb2.StatusResponse(
+                success=ok,
+                state=state,
+                message=msg,
+                frame_count=frame_count
+            )
 
-            # Define and attach the servicer dynamically
-            class Servicer(scanner_pb2_grpc.ScannerServiceServicer):
-                # Implement methods matching proto
-                def StartCapture(inner_self, request, context):
-                    ok, msg = self._impl.StartCapture(request)
-                    return scanner_pb2.CaptureResponse(success=ok, message=msg)
-
-                def GetStatus(inner_self, request, context):
-                    ok, state, msg, frame_count = self._impl.GetStatus(request)
-                    return scanner_pb2.StatusResponse(
-                        success=ok,
+        async def PauseScan(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.PauseScan, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+
+        async def ResumeScan(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.ResumeScan, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+
+        async def CaptureFrame(self, request, context):
+            ok, path, msg = await self._run_blocking(self._impl.CaptureFrame, request)
+            return scanner_pb2.FrameCaptureResponse(success=ok, path=path, message=msg)
+
+        async def Shutdown(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.Shutdown, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+
+        async def StreamStatus(self, request, context):
+            # Server streaming of status updates until client cancels
+            try:
+                async for state, frame_count in self._iterate_blocking(
+                    self._impl.StreamStatus, request
+                ):
+                    yield scanner_pb2.StateUpdate(
                         state=state,
-                        message=msg,
+                        message="",
                         frame_count=frame_count
                     )
+            except Exception as e:
+                logger.error("StreamStatus error: %s", e)
+                return
 
-                def PauseScan(inner_self, request, context):
-                    ok, msg = self._impl.PauseScan(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
+        async def StreamStatusBatched(self, request, context):
+            # Server streaming of coalesced status updates until client cancels
+            try:
+                async for batch in self._iterate_blocking(
+                    self._impl.StreamStatusBatched, request
+                ):
+                    yield scanner_pb2.StateUpdateBatch(updates=[
+                        scanner_pb2.StateUpdate(state=state, message="", frame_count=count)
+                        for state, count in batch
+                    ])
+            except Exception as e:
+                logger.error("StreamStatusBatched error: %s", e)
+                return
 
-                def ResumeScan(inner_self, request, context):
-                    ok, msg = self._impl.ResumeScan(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
+        async def StreamPreview(self, request, context):
+            # Server streaming of preview frames
+            # JPEG payloads barely shrink under gzip: compress only on request
+            if request.prefer_compression:
+                context.set_compression(grpc.Compression.Gzip)
+            try:
+                async for jpeg_data, width, height, timestamp in self._iterate_blocking(
+                    self._impl.StreamPreview, request
+                ):
+                    frame = scanner_pb2.PreviewFrame(
+                        image_data=jpeg_data,
+                        width=width,
+                        height=height,
+                        timestamp=timestamp
+                    )
+                    yield frame
+            except Exception as e:
+                logger.error("StreamPreview gRPC error: %s", e)
+                return
 
-                def CaptureFrame(inner_self, request, context):
-                    ok, path, msg = self._impl.CaptureFrame(request)
-                    return scanner_pb2.FrameCaptureResponse(success=ok, path=path, message=msg)
+        async def MoveMotor(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.MoveMotor, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+        
+        async def CalculateColourGains(self, request, context):
+            ok, msg, r_gain, b_gain = await self._run_blocking(
+                self._impl.CalculateColourGains, request
+            )
+            return scanner_pb2.ColourGainsResponse(
+                success=ok, 
+                message=msg, 
+                r_gain=r_gain, 
+                b_gain=b_gain
+            )
+        
+        async def SetCameraPreset(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.SetCameraPreset, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+        
+        async def GetCameraPreset(self, request, context):
+            ok, msg, preset_name, controls = await self._run_blocking(
+                self._impl.GetCameraPreset, request
+            )
+            return scanner_pb2.PresetInfoResponse(
+                success=ok,
+                message=msg,
+                preset_name=preset_name,
+                controls=controls
+            )
+        
+        async def ListCameraPresets(self, request, context):
+            ok, msg, presets = await self._run_blocking(
+                self._impl.ListCameraPresets, request
+            )
+            return scanner_pb2.PresetListResponse(
+                success=ok,
+                message=msg,
+                preset_names=presets
+            )
+        
+        async def CreateCameraPreset(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.CreateCameraPreset, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
+        
+        async def SetCameraControls(self, request, context):
+            ok, msg = await self._run_blocking(self._impl.SetCameraControls, request)
+            return scanner_pb2.BasicResponse(success=ok, message=msg)
 
-                def Shutdown(inner_self, request, context):
-                    ok, msg = self._impl.Shutdown(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
+        async def _run_blocking(self, func, *args):
+            """Run a blocking implementation call on the handler pool."""
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._blocking_pool, func, *args)
 
-                def StreamStatus(inner_self, request, context):
-                    # Server streaming of status updates until client cancels
-                    try:
-                        while not context.is_active():
-                            break
-                        
-                        while context.is_active():
-                            state = self._impl.controller.current_state()
-                            frame_count = len(self._impl.controller.frames)
-                            update = scanner_pb2.StateUpdate(
-                                state=state,
-                                message="",
-                                frame_count=frame_count
-                            )
-                            yield update
-                            time.sleep(0.5)
-                    except Exception as e:
-                        logger.error(f"StreamStatus error: {e}")
-                        return
+        async def _iterate_blocking(self, stream, request):
+            """Drive a blocking stream generator from the event loop, one item per task.
 
-                def StreamPreview(inner_self, request, context):
-                    # Server streaming of preview frames
-                    try:
-                        for jpeg_data, width, height, timestamp in self._impl.StreamPreview(request):
-                            if not context.is_active():
-                                break
-                            
-                            frame = scanner_pb2.PreviewFrame(
-                                image_data=jpeg_data,
-                                width=width,
-                                height=height,
-                                timestamp=timestamp
-                            )
-                            yield frame
-                    except Exception as e:
-                        logger.error(f"StreamPreview gRPC error: {e}")
+            `stream` is an implementation method taking (request, stop); `stop`
+            is set when the RPC ends so the generator returns within its wait.
+            Each stream gets its own thread: generators block between items
+            (waiting for frames or status changes), and doing that on the
+            shared handler pool would starve unary RPCs such as Shutdown.
+            """
+            stop = threading.Event()
+            gen = stream(request, stop)
+            executor = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="grpc-stream")
+            pending = None
+            try:
+                while True:
+                    pending = executor.submit(next, gen, _STREAM_END)
+                    item = await asyncio.wrap_future(pending)
+                    if item is _STREAM_END:
                         return
+                    yield item
+            finally:
+                # Client cancelled or stream ended: close the generator once the
+                # in-flight next() returns (closing it mid-call would raise)
+                stop.set()
+                if pending is not None:
+                    pending.add_done_callback(lambda _: gen.close())
+                executor.shutdown(wait=False)
 
-                def MoveMotor(inner_self, request, context):
-                    ok, msg = self._impl.MoveMotor(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
-                
-                def CalculateColourGains(inner_self, request, context):
-                    ok, msg, r_gain, b_gain = self._impl.CalculateColourGains(request)
-                    return scanner_pb2.ColourGainsResponse(
-                        success=ok, 
-                        message=msg, 
-                        r_gain=r_gain, 
-                        b_gain=b_gain
-                    )
-                
-                def SetCameraPreset(inner_self, request, context):
-                    ok, msg = self._impl.SetCameraPreset(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
-                
-                def GetCameraPreset(inner_self, request, context):
-                    ok, msg, preset_name, controls = self._impl.GetCameraPreset(request)
-                    return scanner_pb2.PresetInfoResponse(
-                        success=ok,
-                        message=msg,
-                        preset_name=preset_name,
-                        controls=controls
-                    )
-                
-                def ListCameraPresets(inner_self, request, context):
-                    ok, msg, presets = self._impl.ListCameraPresets(request)
-                    return scanner_pb2.PresetListResponse(
-                        success=ok,
-                        message=msg,
-                        preset_names=presets
-                    )
-                
-                def CreateCameraPreset(inner_self, request, context):
-                    ok, msg = self._impl.CreateCameraPreset(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
-                
-                def SetCameraControls(inner_self, request, context):
-                    ok, msg = self._impl.SetCameraControls(request)
-                    return scanner_pb2.BasicResponse(success=ok, message=msg)
+    class GRPCServer:
+        """
+        grpc.aio server running its event loop on a dedicated thread, so the
+        blocking start()/stop() API stays as before. Network I/O for every
+        connection is multiplexed on that loop; controller, camera and motor
+        calls block, so handlers run them on a small thread pool.
+        """
+
+        def __init__(self, controller: PipelineController, host: str = "[::]", port: int = 50051):
+            self.controller = controller
+            self.host = host
+            self.port = port
+            self.server = None
+            self._impl = ScannerServiceImpl(controller)
+            self._blocking_pool = futures.ThreadPoolExecutor(
+                max_workers=8, thread_name_prefix="grpc-blocking"
+            )
+            self._loop = _new_event_loop()
+            self._loop_thread = None
+
+            self._servicer = Servicer(self._impl, self._blocking_pool)
 
-            scanner_pb2_grpc.add_ScannerServiceServicer_to_server(Servicer(), self.server)
+        async def _serve(self):
+            # Control RPCs are tiny: no compression unless a call asks for it
+            self.server = grpc.aio.server(
+                options=_SERVER_OPTIONS, compression=grpc.Compression.NoCompression
+            )
+            scanner_pb2_grpc.add_ScannerServiceServicer_to_server(self._servicer, self.server)
             self.server.add_insecure_port(f"{self.host}:{self.port}")
+            await self.server.start()
 
         def start(self):
-            self.server.start()
+            self._loop_thread = threading.Thread(
+                target=self._loop.run_forever, name="grpc-aio", daemon=True
+            )
+            self._loop_thread.start()
+            asyncio.run_coroutine_threadsafe(self._serve(), self._loop).result()
             logger.info(f"gRPC server started on {self.host}:{self.port}")
 
         def stop(self, grace=5):
-            self.server.stop(grace)
+            if self.server is not None:
+                asyncio.run_coroutine_threadsafe(self.server.stop(grace), self._loop).result()
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            if self._loop_thread is not None:
+                self._loop_thread.join()
+            self._blocking_pool.shutdown(wait=False)
+            self._impl.close()
             logger.info("gRPC server stopped")
 
 else:
@@ -591,6 +983,7 @@ def run_server(controller: PipelineController, host: str = "[::]", port: int = 5
             time.sleep(1)
     except KeyboardInterrupt:
         server.stop(0)
+        controller.shutdown()
 
 
 if __name__ == "__main__":
@@ -1,3 +1,4 @@
+from concurrent.futures import ThreadPoolExecutor
 import logging
 import os
 from pathlib import Path
@@ -29,7 +30,7 @@ class _MockGPIO:
     def setup(self, _pin, _direction, initial=LOW):
         return initial
 
-    def output(self, _pin, _value):
+    def output(self, _pins, _values):
         return None
 
     def cleanup(self, _pins=None):
@@ -49,19 +50,22 @@ class Stepper28BYJ48:
     """
 
     # Half-step sequence (8 steps)
-    HALF_STEP_SEQ = [
-        [1, 0, 0, 0],
-        [1, 1, 0, 0],
-        [0, 1, 0, 0],
-        [0, 1, 1, 0],
-        [0, 0, 1, 0],
-        [0, 0, 1, 1],
-        [0, 0, 0, 1],
-        [1, 0, 0, 1],
-    ]
+    HALF_STEP_SEQ = (
+        (1, 0, 0, 0),
+        (1, 1, 0, 0),
+        (0, 1, 0, 0),
+        (0, 1, 1, 0),
+        (0, 0, 1, 0),
+        (0, 0, 1, 1),
+        (0, 0, 0, 1),
+        (1, 0, 0, 1),
+    )
 
     # Motor specifications (internal gear ratio 64:1)
     STEPS_PER_REV = 4096
+    # Final stretch of each step delay spent spinning instead of sleeping:
+    # covers the scheduler's wake-up latency
+    _SPIN_NS = 200_000
     _SIMULATION_ENV_VAR = "NEGANUKI_SIMULATE_GPIO"
     _DEVICE_TREE_MODEL_PATHS = (
         Path("/proc/device-tree/model"),
@@ -80,15 +84,32 @@ class Stepper28BYJ48:
         self.delay = delay
         self.initialized = False
         self.step_count = len(self.HALF_STEP_SEQ)
+        # step() wraps the sequence index with a mask instead of a modulo
+        assert self.step_count == 8, "HALF_STEP_SEQ must have 8 entries"
         self.current_step = 0
         self.total_steps = 0  # Absolute position tracking
         self.simulated = False
         self.is_raspberry_pi = self._detect_raspberry_pi()
         self.gpio = self._resolve_gpio_backend()
+        # Moves run one at a time on this thread, so callers can wait on a
+        # Future (or not at all) instead of blocking for steps * delay
+        self._executor = self._new_executor()
+        # Bumped by stop(): moves submitted under an older generation abort
+        # at their next step, whether running or still queued
+        self._abort_gen = 0
+        # Output levels per sequence step, built once for the chosen backend
+        self._step_levels = tuple(
+            tuple(self.gpio.HIGH if val else self.gpio.LOW for val in seq)
+            for seq in self.HALF_STEP_SEQ
+        )
 
         # Initialize GPIO
         self._initialize_gpio()
 
+    @staticmethod
+    def _new_executor():
+        return ThreadPoolExecutor(max_workers=1, thread_name_prefix="stepper")
+
     def _resolve_gpio_backend(self):
         simulate_gpio = os.getenv(self._SIMULATION_ENV_VAR, "").strip().lower()
         force_simulation = simulate_gpio in {"1", "true", "yes", "on"}
@@ -181,6 +202,17 @@ class Stepper28BYJ48:
         :param direction: 1 = CW, -1 = CCW
         :return: True if successful, False if failed
         """
+        return self.step_async(steps, direction).result()
+
+    def step_async(self, steps=1, direction=1):
+        """
+        Queue a move on the stepper thread and return immediately.
+
+        :return: concurrent.futures.Future resolving to step()'s result
+        """
+        return self._executor.submit(self._step, steps, direction, self._abort_gen)
+
+    def _step(self, steps, direction, abort_gen):
         if steps < 0:
             self.log.error(f"Invalid steps value: {steps} (must be >= 0)")
             return False
@@ -194,14 +226,29 @@ class Stepper28BYJ48:
             return False
 
         try:
+            delay_ns = int(self.delay * 1e9)
+            deadline_ns = time.perf_counter_ns()
             for _ in range(steps):
-                self.current_step = (self.current_step + direction) % self.step_count
-                seq = self.HALF_STEP_SEQ[self.current_step]
-
-                for pin, val in zip(self.pins, seq):
-                    self.gpio.output(pin, self.gpio.HIGH if val else self.gpio.LOW)
-
-                time.sleep(self.delay)
+                if self._abort_gen != abort_gen:
+                    self.gpio.output(self.pins, self.gpio.LOW)
+                    self.log.warning(
+                        "Move aborted by stop() at position %s", self.total_steps
+                    )
+                    return False
+
+                # & 7 wraps -1 to 7 exactly like % 8
+                self.current_step = (self.current_step + direction) & 7
+
+                # One call drives all four coils (RPi.GPIO accepts channel/value lists)
+                self.gpio.output(self.pins, self._step_levels[self.current_step])
+
+                # Steps are paced against a running deadline, not back-to-back
+                # sleeps; an overrun restarts the schedule instead of bursting
+                deadline_ns += delay_ns
+                now_ns = time.perf_counter_ns()
+                if deadline_ns < now_ns:
+                    deadline_ns = now_ns + delay_ns
+                self._wait_until(deadline_ns)
                 self.total_steps += direction
 
             self.log.debug(
@@ -216,6 +263,14 @@ class Stepper28BYJ48:
             self.log.error(f"Step failed: {e}")
             return False
 
+    def _wait_until(self, deadline_ns):
+        """Sleep until shortly before `deadline_ns`, then spin to it on perf_counter_ns."""
+        remaining_ns = deadline_ns - time.perf_counter_ns()
+        if remaining_ns > self._SPIN_NS:
+            time.sleep((remaining_ns - self._SPIN_NS) / 1e9)
+        while time.perf_counter_ns() < deadline_ns:
+            pass
+
     def rotate_deg(self, degrees, direction=1):
         """
         Rotate the motor by an approximate number of degrees.
@@ -240,15 +295,16 @@ class Stepper28BYJ48:
     def stop(self):
         """
         Stop the motor safely (turn off all coils).
-        Useful for emergency stop.
+        Useful for emergency stop: the running move and any queued ones
+        abort before their next step and resolve to False.
         """
+        self._abort_gen += 1
         if not self.initialized:
             self.log.warning("Cannot stop: GPIO not initialized")
             return False
 
         try:
-            for pin in self.pins:
-                self.gpio.output(pin, self.gpio.LOW)
+            self.gpio.output(self.pins, self.gpio.LOW)
             self.log.info("Motor stopped (all coils off)")
             return True
         except Exception as e:
@@ -265,9 +321,7 @@ class Stepper28BYJ48:
             return False
 
         try:
-            seq = self.HALF_STEP_SEQ[self.current_step]
-            for pin, val in zip(self.pins, seq):
-                self.gpio.output(pin, self.gpio.HIGH if val else self.gpio.LOW)
+            self.gpio.output(self.pins, self._step_levels[self.current_step])
             self.log.debug("Motor holding position")
             return True
         except Exception as e:
@@ -300,6 +354,10 @@ class Stepper28BYJ48:
         Turn off pins and safely release GPIO.
         Does not raise exceptions, only logs errors.
         """
+        # Abort the running move, drop queued ones and retire the stepper thread
+        self._abort_gen += 1
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
         if not self.initialized:
             self.log.warning("GPIO not initialized, nothing to cleanup")
             return
@@ -326,6 +384,7 @@ class Stepper28BYJ48:
         self.log.info("Reinitializing motor")
         self.cleanup()
         time.sleep(0.5)
+        self._executor = self._new_executor()
         self._initialize_gpio()
         self.log.info("Motor reinitialized successfully")
 
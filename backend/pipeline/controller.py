@@ -1,6 +1,10 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 import logging
+import threading
 import cv2
+import numpy as np
 
 from backend.fsm import ScannerFSM
 from backend.camera import IMX477Camera
@@ -10,6 +14,28 @@ from backend.pipeline.stitcher import Stitcher
 from backend.pipeline.evaluator import CaptureEvaluator
 
 
+# Longest side of the in-memory thumbnail kept for every captured frame
+THUMBNAIL_SIZE = 512
+
+# End-of-film detection runs on the frame scaled by this factor; its
+# brightness and edge-density thresholds are tuned at this scale
+FILM_END_SCALE = 0.25
+
+
+@dataclass
+class FrameRecord:
+    """A captured frame spilled to disk; only its thumbnail stays in memory."""
+    index: int
+    path: Path
+    thumbnail: np.ndarray
+    saved: Future  # resolves once the .npy file is written
+
+    def load(self) -> np.ndarray:
+        """Read the full-resolution frame back (waits for a pending write)."""
+        self.saved.result()
+        return np.load(self.path)
+
+
 class PipelineController:
     """
     Orchestrates the entire scanning workflow:
@@ -46,6 +72,11 @@ class PipelineController:
         self.cropper = Cropper()  # No config required, has default
         self.stitcher = Stitcher()
         self.evaluator = CaptureEvaluator()
+        # Picamera2 is not thread-safe: full-resolution captures are
+        # serialized on this single thread, whoever requests them
+        self._camera_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="camera")
+        # Captured frames are written to disk off the FSM thread
+        self._frame_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="frame-writer")
 
         # Initialize camera in preview mode for live preview availability
         try:
@@ -55,8 +86,20 @@ class PipelineController:
             self.log.warning(f"Camera initialization failed: {e}. Preview may not be available.")
 
         # --- Storage ---
+        # One FrameRecord per capture; only the latest frame is kept at full
+        # resolution in memory, so memory stays flat over long scans
+        self.frames_dir = self.output_dir / "frames"
         self.frames = []
+        self.current_frame = None
+        self.current_gray = None  # current_frame in grayscale, converted once per capture
         self.current_stitched = None
+        # Film advance started on leaving stitching; joined before the next capture
+        self._pending_move = None
+
+        # Status change notification: bumped on every state entry and frame
+        # append, so status streams wake up instead of polling
+        self._status_cond = threading.Condition()
+        self._status_seq = 0
 
         # --- FSM ---
         self.fsm = ScannerFSM(callbacks=self._fsm_callbacks(callbacks))
@@ -71,6 +114,7 @@ class PipelineController:
 
         cb.update(
             {
+                "on_enter_idle": self._on_enter_idle,
                 "on_enter_initializing": self._on_enter_initializing,
                 "on_enter_capturing": self._on_enter_capturing,
                 "on_enter_evaluating": self._on_enter_evaluating,
@@ -84,12 +128,31 @@ class PipelineController:
                 "on_enter_motor_error": self._on_enter_motor_error,
             }
         )
+        # Every state entry is a status change
+        for name, func in cb.items():
+            if name.startswith("on_enter_"):
+                cb[name] = self._notifying(func)
         return cb
 
+    def _notifying(self, func):
+        def callback(*args, **kwargs):
+            self._notify_status_change()
+            return func(*args, **kwargs)
+
+        return callback
+
+    def _notify_status_change(self):
+        with self._status_cond:
+            self._status_seq += 1
+            self._status_cond.notify_all()
+
     # ----------------------------------------------------------------------
     # ENGINE CALLS FOR EACH STATE
     # ----------------------------------------------------------------------
 
+    def _on_enter_idle(self):
+        pass
+
     def _on_enter_initializing(self):
         self.log.info("Initializing scanner...")
         
@@ -115,9 +178,15 @@ class PipelineController:
     def _on_enter_capturing(self):
         self.log.info("Capturing frame...")
         self.fsm.reset_retry_count()  # Reset retry counter for new capture
+
+        # Normally joined in checking_completion; a resume after pausing
+        # mid-advance reaches here with the move still running
+        if not self._join_pending_move():
+            self.fsm.fail()
+            return
         
         try:
-            frame = self.camera.capture_frame()
+            frame = self.capture_frame_async().result()
         except Exception as e:
             self.log.error(f"Camera capture failed: {e}")
             self.fsm.camera_fail()
@@ -128,16 +197,45 @@ class PipelineController:
             self.fsm.camera_fail()
             return
 
-        self.frames.append(frame)
+        self.current_frame = frame
+        self.current_gray = (
+            cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        )
+        self.frames.append(self._spill_frame(frame))
+        self._notify_status_change()
         self.fsm.capture_done()
 
+    def _spill_frame(self, frame):
+        """Queue `frame` for writing to frames_dir and return its FrameRecord."""
+        index = len(self.frames)
+        path = self.frames_dir / f"frame_{index:04d}.npy"
+        h, w = frame.shape[:2]
+        scale = THUMBNAIL_SIZE / max(h, w)
+        thumbnail = cv2.resize(
+            frame, (max(1, round(w * scale)), max(1, round(h * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+        saved = self._frame_writer.submit(self._write_frame, path, frame)
+        saved.add_done_callback(self._log_frame_write_failure)
+        return FrameRecord(index, path, thumbnail, saved)
+
+    @staticmethod
+    def _write_frame(path, frame):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, frame)
+
+    def _log_frame_write_failure(self, future):
+        error = future.exception()
+        if error is not None:
+            self.log.error(f"Failed to write frame to disk: {error}")
+
     def _on_enter_evaluating(self):
         self.log.info("Evaluating frame quality...")
 
-        curr_frame = self.frames[-1]
+        curr_frame = self.current_frame
         
         # Check frame quality (sharpness, exposure, etc.)
-        is_acceptable = self.evaluator.is_frame_acceptable(curr_frame)
+        is_acceptable = self.evaluator.is_frame_acceptable(curr_frame, gray=self.current_gray)
 
         if not is_acceptable:
             self.log.warning("Frame quality insufficient, retrying...")
@@ -154,7 +252,11 @@ class PipelineController:
     def _on_enter_stitching(self):
         self.log.info("Stitching frames...")
 
-        self.current_stitched = self.stitcher.stitch(self.frames)
+        # Only accepted frames reach this state: warp just the new one into
+        # the stitcher's running mosaic instead of re-stitching every frame
+        self.current_stitched = self.stitcher.append_and_get(
+            self.current_frame, gray=self.current_gray
+        )
 
         if self.current_stitched is None:
             self.log.error("Stitch failed.")
@@ -170,19 +272,30 @@ class PipelineController:
     def _on_enter_advancing(self):
         self.log.info("Advancing stepper...")
 
+        # The move runs on the stepper thread while completion is checked;
+        # it is joined before the next capture
         try:
-            ok = self.motor.step(50)  # You can later parameterize this
+            self._pending_move = self.motor.step_async(50)  # You can later parameterize this
         except Exception as e:
             self.log.error(f"Motor failed with exception: {e}")
             self.fsm.motor_fail()
             return
 
+        self.fsm.advance_done()
+
+    def _join_pending_move(self):
+        """Wait for the film advance in flight, if any; False if it failed."""
+        move, self._pending_move = self._pending_move, None
+        if move is None:
+            return True
+        try:
+            ok = move.result()
+        except Exception as e:
+            self.log.error(f"Motor failed with exception: {e}")
+            return False
         if not ok:
             self.log.error("Stepper failed.")
-            self.fsm.motor_fail()
-            return
-
-        self.fsm.advance_done()
+        return ok
 
     def _on_enter_checking_completion(self):
         self.log.info("Checking if scan is complete...")
@@ -195,13 +308,13 @@ class PipelineController:
 
         # Check 2: Film end detection (if enabled)
         if self.detect_film_end:
-            curr_frame = self.frames[-1]
-            
-            # Convert to grayscale for analysis
-            if len(curr_frame.shape) == 3:
-                gray = cv2.cvtColor(curr_frame, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = curr_frame
+            # Grayscale was computed once at capture
+            gray = self.current_gray
+            # Brightness and edge density barely change with scale: analyse a
+            # reduced copy
+            gray = cv2.resize(
+                gray, None, fx=FILM_END_SCALE, fy=FILM_END_SCALE, interpolation=cv2.INTER_AREA
+            )
             
             # Check if frame is mostly black (end of film)
             mean_brightness = gray.mean()
@@ -222,7 +335,11 @@ class PipelineController:
                 self.fsm.scan_complete()
                 return
         
-        # Otherwise, continue scanning
+        # Otherwise, continue scanning once the film has advanced
+        if not self._join_pending_move():
+            self.fsm.motor_fail()
+            return
+
         self.log.info("More frames needed, continuing scan...")
         self.fsm.more_frames()
 
@@ -272,8 +389,12 @@ class PipelineController:
     def start_scan(self):
         """Start a new scan session."""
         self.frames = []
+        self.current_frame = None
+        self.current_gray = None
         self.current_stitched = None
+        self._pending_move = None
         self.stitcher.reset()  # Reset stitcher for new scan
+        self._notify_status_change()
         self.fsm.start()
 
     def pause_scan(self):
@@ -305,5 +426,37 @@ class PipelineController:
     def current_state(self):
         return self.fsm.state
 
+    def capture_frame_async(self):
+        """Capture a full-resolution frame on the camera thread; returns a Future."""
+        return self._camera_executor.submit(self.camera.capture_frame)
+
+    @property
+    def status_seq(self):
+        """Counter bumped on every state entry and frame-list change."""
+        return self._status_seq
+
+    def wait_for_status_change(self, seq, timeout=None):
+        """Block until the status changed since `seq` was read, or `timeout` passed.
+
+        Returns the current sequence number; pass it to the next call.
+        """
+        with self._status_cond:
+            self._status_cond.wait_for(lambda: self._status_seq != seq, timeout)
+            return self._status_seq
+
     def abort(self):
         self.fsm.abort()
+
+    def shutdown(self):
+        """Release the controller's worker threads once the scanner is done with.
+
+        Waits for a capture in flight and for every queued frame to reach
+        disk, then detaches the FSM; camera and motor are left to their own
+        shutdown()/cleanup().
+        """
+        self._camera_executor.shutdown(wait=True, cancel_futures=True)
+        # Frames are only on disk once written: flush the queue, never cancel it
+        self._frame_writer.shutdown(wait=True)
+        # The Machine graph is shared across ScannerFSM instances and holds
+        # a reference to every model it drives
+        self.fsm.detach()
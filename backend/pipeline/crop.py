@@ -1,7 +1,7 @@
 import cv2
 import numpy as np
 from dataclasses import dataclass
-from typing import Tuple
+from typing import List, Optional, Tuple
 
 
 @dataclass
@@ -23,34 +23,71 @@ class Cropper:
 
     def __init__(self, config: CropConfig = None):
         self.config = config or CropConfig()  # Default to empty config
+        # Crop bounds for the last (frame size, config) seen: frames in a
+        # scan share both, so the bounds math runs once per scan
+        self._bounds_key = None
+        self._bounds = None
 
     def update_config(self, config: CropConfig):
         """Allows dynamic runtime reconfiguration."""
         self.config = config
 
+    def _compile(self, shape) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Resolve (y1, y2, x1, x2) for frames of `shape` under the current config.
+        Returns None when the frame should be passed through uncropped.
+        """
+        c = self.config
+        key = (shape[0], shape[1], c.x, c.y, c.width, c.height)
+        if key == self._bounds_key:
+            return self._bounds
+
+        bounds = None
+        if c.is_valid():
+            h, w = shape[:2]
+
+            x1 = max(0, c.x)
+            y1 = max(0, c.y)
+            x2 = min(w, x1 + c.width)
+            y2 = min(h, y1 + c.height)
+
+            if x1 < x2 and y1 < y2:  # otherwise an invalid crop region
+                bounds = (y1, y2, x1, x2)
+
+        self._bounds_key = key
+        self._bounds = bounds
+        return bounds
+
     def crop(self, frame: np.ndarray) -> np.ndarray:
         """
         Crop the frame according to the current config.
         If config is invalid or out-of-bounds, returns the original frame.
+        The result is a view into `frame`, not a copy.
         """
         if frame is None or frame.size == 0:
             return frame
 
-        if not self.config.is_valid():
+        bounds = self._compile(frame.shape)
+        if bounds is None:
             return frame
 
-        h, w = frame.shape[:2]
-
-        x1 = max(0, self.config.x)
-        y1 = max(0, self.config.y)
-        x2 = min(w, x1 + self.config.width)
-        y2 = min(h, y1 + self.config.height)
+        y1, y2, x1, x2 = bounds
+        return frame[y1:y2, x1:x2]
 
-        if x1 >= x2 or y1 >= y2:
-            # Invalid crop region
-            return frame
+    def batch_crop(self, frames: List[np.ndarray]) -> List[np.ndarray]:
+        """Crop several frames; same-sized frames share one bounds computation."""
+        return [self.crop(frame) for frame in frames]
 
-        return frame[y1:y2, x1:x2]
+    def crop_into(self, out: np.ndarray, frame: np.ndarray) -> np.ndarray:
+        """
+        Copy the cropped region of `frame` into the preallocated `out` buffer.
+        `out` must have the cropped shape; returns `out`.
+        """
+        region = self.crop(frame)
+        if out.shape != region.shape:
+            raise ValueError(f"Output buffer shape {out.shape} does not match crop {region.shape}")
+        np.copyto(out, region)
+        return out
 
     def crop_center(self, frame: np.ndarray, size: Tuple[int, int]) -> np.ndarray:
         """
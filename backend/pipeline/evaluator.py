@@ -17,7 +17,9 @@ class CaptureEvaluator:
         orb_threshold: int = 40,            # minimal new keypoints to detect new content
         sharpness_threshold: float = 100.0, # Laplacian variance threshold for blur detection
         brightness_min: float = 30.0,       # minimum acceptable mean brightness
-        brightness_max: float = 225.0       # maximum acceptable mean brightness
+        brightness_max: float = 225.0,      # maximum acceptable mean brightness
+        analysis_scale: float = 1.0,        # downscale factor for sharpness/ORB analysis (thresholds are tuned at 1.0)
+        match_distance: int = 64            # max Hamming distance of a matched ORB keypoint
     ):
         self.strip_ratio = strip_ratio
         self.diff_threshold = diff_threshold
@@ -25,11 +27,18 @@ class CaptureEvaluator:
         self.sharpness_threshold = sharpness_threshold
         self.brightness_min = brightness_min
         self.brightness_max = brightness_max
+        self.analysis_scale = analysis_scale
+        self.match_distance = match_distance
         self.orb = cv2.ORB_create(nfeatures=1000)
+        # Approximate nearest neighbours over binary ORB descriptors (FLANN LSH index)
+        self.matcher = cv2.FlannBasedMatcher(
+            dict(algorithm=6, table_number=6, key_size=12, multi_probe_level=1), {}
+        )
 
-    def is_frame_acceptable(self, frame: np.ndarray) -> bool:
+    def is_frame_acceptable(self, frame: np.ndarray, gray: np.ndarray = None) -> bool:
         """
         Check if a single frame meets quality standards.
+        Pass `gray` when the grayscale frame is already at hand to skip the conversion.
         
         Returns True if frame is acceptable (sharp, well-exposed).
         Returns False if frame should be recaptured.
@@ -37,14 +46,18 @@ class CaptureEvaluator:
         if frame is None or frame.size == 0:
             return False
 
-        # Convert to grayscale for analysis
-        if len(frame.shape) == 3:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        else:
-            gray = frame
-
-        # 1. Check sharpness using Laplacian variance
-        laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+        # Convert to grayscale for analysis, unless the caller already did
+        if gray is None:
+            if len(frame.shape) == 3:
+                gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            else:
+                gray = frame
+
+        # 1. Check sharpness using Laplacian variance, measured at analysis_scale
+        # (sharpness_threshold applies at that resolution)
+        # A 3x3 Laplacian of uint8 input fits int16; meanStdDev reduces it in one pass
+        laplacian = cv2.Laplacian(self._downsample(gray), cv2.CV_16S)
+        laplacian_var = cv2.meanStdDev(laplacian)[1][0, 0] ** 2
         
         if laplacian_var < self.sharpness_threshold:
             return False  # Too blurry
@@ -57,10 +70,18 @@ class CaptureEvaluator:
 
         return True
 
-    def needs_more_captures(self, prev_frame: np.ndarray, curr_frame: np.ndarray) -> bool:
+    def needs_more_captures(
+        self,
+        prev_frame: np.ndarray,
+        curr_frame: np.ndarray,
+        prev_gray: np.ndarray = None,
+        curr_gray: np.ndarray = None,
+    ) -> bool:
         """
         Returns True if another capture is necessary.
         False if current frame already contains enough new information.
+        Pass the frames' grayscale versions when at hand: the strips are then
+        taken as views of them, without any conversion.
         """
 
         if prev_frame is None or curr_frame is None:
@@ -69,37 +90,39 @@ class CaptureEvaluator:
         # Resize to same size if small differences exist
         if prev_frame.shape != curr_frame.shape:
             curr_frame = cv2.resize(curr_frame, (prev_frame.shape[1], prev_frame.shape[0]))
+            curr_gray = None  # no longer matches the resized frame
 
         h, w = prev_frame.shape[:2]
         strip_h = int(h * self.strip_ratio)
 
-        prev_strip = prev_frame[-strip_h:, :]
-        curr_strip = curr_frame[:strip_h, :]
+        # Grayscale strips: bottom of the previous frame, top of the current one
+        prev_g = self._gray_strip(prev_frame, prev_gray, slice(h - strip_h, h))
+        curr_g = self._gray_strip(curr_frame, curr_gray, slice(0, strip_h))
 
-        # Convert to grayscale
-        prev_g = cv2.cvtColor(prev_strip, cv2.COLOR_BGR2GRAY)
-        curr_g = cv2.cvtColor(curr_strip, cv2.COLOR_BGR2GRAY)
-
-        # A. Mean absolute difference
-        diff = np.mean(np.abs(prev_g.astype(np.float32) - curr_g.astype(np.float32)))
+        # A. Mean absolute difference (uint8 SIMD in OpenCV, no float temporaries)
+        diff = cv2.mean(cv2.absdiff(prev_g, curr_g))[0]
 
         if diff >= self.diff_threshold:
             # Sufficient difference => new information => no more captures needed
             return False
 
-        # B. Keypoint backup detection
-        kp1, des1 = self.orb.detectAndCompute(prev_g, None)
-        kp2, des2 = self.orb.detectAndCompute(curr_g, None)
+        # B. Keypoint backup detection, on downsampled strips
+        kp1, des1 = self.orb.detectAndCompute(self._downsample(prev_g), None)
+        kp2, des2 = self.orb.detectAndCompute(self._downsample(curr_g), None)
 
         if des1 is None or des2 is None:
             # If ORB fails, be conservative: continue capturing
             return True
 
-        bf = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
-        matches = bf.match(des1, des2)
+        # Nearest previous keypoint for each current one; LSH may find none
+        knn = self.matcher.knnMatch(des2, des1, k=1)
+        matched = sum(
+            1 for candidates in knn
+            if candidates and candidates[0].distance <= self.match_distance
+        )
 
         # New keypoints = keypoints not well-matched
-        new_points = len(kp2) - len(matches)
+        new_points = len(kp2) - matched
 
         if new_points >= self.orb_threshold:
             return False  # enough new points => frame contains new content
@@ -107,6 +130,31 @@ class CaptureEvaluator:
         # Otherwise more capture is needed
         return True
 
+    @staticmethod
+    def _gray_strip(frame: np.ndarray, gray: np.ndarray, rows: slice) -> np.ndarray:
+        """
+        Helper method returning rows of the frame in grayscale.
+        Full-width row ranges of `gray` are views; only colour strips are converted.
+        """
+        if gray is not None:
+            return gray[rows]
+        strip = frame[rows]
+        if len(strip.shape) == 3:
+            return cv2.cvtColor(strip, cv2.COLOR_BGR2GRAY)
+        return strip
+
+    def _downsample(self, gray_frame: np.ndarray) -> np.ndarray:
+        """
+        Helper method to shrink a grayscale frame by analysis_scale.
+        Returns the frame unchanged when the scale is 1 or more.
+        """
+        if self.analysis_scale >= 1.0:
+            return gray_frame
+        return cv2.resize(
+            gray_frame, None, fx=self.analysis_scale, fy=self.analysis_scale,
+            interpolation=cv2.INTER_AREA
+        )
+
     def _detect_edges(self, gray_frame: np.ndarray) -> np.ndarray:
         """
         Helper method to detect edges in a grayscale frame.
@@ -28,6 +28,11 @@ class Stitcher:
         self.matcher = cv2.BFMatcher(cv2.NORM_HAMMING, crossCheck=True)
         self.frames: List[np.ndarray] = []  # original frames
         self.transforms: List[np.ndarray] = []  # cumulative transforms
+        self._last_gray: Optional[np.ndarray] = None  # grayscale of frames[-1]
+        # Running mosaic kept by append_and_get, and the (x, y) position of
+        # its top-left pixel in the first frame's coordinates
+        self._mosaic: Optional[np.ndarray] = None
+        self._mosaic_origin = (0, 0)
 
         # Start with identity transform
         self.transforms.append(np.eye(3, dtype=np.float32))
@@ -36,25 +41,44 @@ class Stitcher:
         """Remove all frames and restart stitching session."""
         self.frames.clear()
         self.transforms = [np.eye(3, dtype=np.float32)]
+        self._last_gray = None
+        self._mosaic = None
+        self._mosaic_origin = (0, 0)
 
-    def add_frame(self, frame: np.ndarray):
+    def add_frame(self, frame: np.ndarray, gray: Optional[np.ndarray] = None):
         """
         Add a new frame to the stitcher.
         If it is the first frame, no stitching is done yet.
+        Pass `gray` when the grayscale frame is already at hand to skip the conversion.
+
+        Not allowed once append_and_get() started the session's running
+        mosaic (earlier frames are no longer kept): reset() first.
         """
+        if self._mosaic is not None:
+            raise RuntimeError(
+                "add_frame() cannot follow append_and_get() in one session; call reset() first"
+            )
+        self._add_frame(frame, gray)
+
+    def _add_frame(self, frame: np.ndarray, gray: Optional[np.ndarray]):
         if frame is None or frame.size == 0:
             return
 
-        frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        if gray is not None:
+            frame_gray = gray
+        elif frame.ndim == 2:
+            frame_gray = frame
+        else:
+            frame_gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        # Previous frame's grayscale was kept from its own add_frame call
+        prev_gray = self._last_gray
+        self._last_gray = frame_gray
 
         if not self.frames:
             self.frames.append(frame)
             return
 
-        # Previous frame
-        prev_frame = self.frames[-1]
-        prev_gray = cv2.cvtColor(prev_frame, cv2.COLOR_BGR2GRAY)
-
         # Find features
         kp1, des1 = self.detector.detectAndCompute(prev_gray, None)
         kp2, des2 = self.detector.detectAndCompute(frame_gray, None)
@@ -94,10 +118,83 @@ class Stitcher:
         self.transforms.append(cumulative)
         self.frames.append(frame)
 
+    def append_and_get(
+        self, frame: np.ndarray, gray: Optional[np.ndarray] = None
+    ) -> Optional[np.ndarray]:
+        """
+        Add a frame and return the updated mosaic, doing work for the new frame only.
+
+        Only the new frame is warped, into a mosaic kept between calls, and
+        only the latest frame is retained for matching the next one, so cost
+        and memory stay flat however long the scan. The returned array is
+        updated in place by later calls; copy it to keep a snapshot.
+        Frames already added with add_frame() are pasted in first; after
+        this call, add_frame() is refused until reset().
+        """
+        if self._mosaic is None:
+            for prev, H in zip(self.frames, self.transforms):
+                self._paste(prev, H)
+
+        count = len(self.frames)
+        self._add_frame(frame, gray)
+        if len(self.frames) == count:
+            return self._mosaic  # empty frame, nothing added
+
+        self._paste(self.frames[-1], self.transforms[-1])
+
+        # Earlier frames are already in the mosaic: drop them
+        del self.frames[:-1]
+        del self.transforms[:-1]
+        return self._mosaic
+
+    def _paste(self, frame: np.ndarray, H: np.ndarray):
+        """Warp `frame` by `H` into the running mosaic, growing it as needed."""
+        h, w = frame.shape[:2]
+        pts = np.float32([[0, 0], [w, 0], [w, h], [0, h]]).reshape(-1, 1, 2)
+        corners = cv2.perspectiveTransform(pts, H)[:, 0, :]
+        fx0, fy0 = np.floor(corners.min(axis=0)).astype(int)
+        fx1, fy1 = np.ceil(corners.max(axis=0)).astype(int)
+
+        if self._mosaic is None:
+            ox, oy = fx0, fy0
+            self._mosaic = np.zeros((fy1 - fy0, fx1 - fx0, 3), dtype=np.uint8)
+        else:
+            ox, oy = self._mosaic_origin
+            mh, mw = self._mosaic.shape[:2]
+            nx0, ny0 = min(ox, fx0), min(oy, fy0)
+            nx1, ny1 = max(ox + mw, fx1), max(oy + mh, fy1)
+            if (nx0, ny0, nx1, ny1) != (ox, oy, ox + mw, oy + mh):
+                # Grow the canvas, keeping what was stitched so far
+                grown = np.zeros((ny1 - ny0, nx1 - nx0, 3), dtype=np.uint8)
+                grown[oy - ny0:oy - ny0 + mh, ox - nx0:ox - nx0 + mw] = self._mosaic
+                self._mosaic = grown
+                ox, oy = nx0, ny0
+        self._mosaic_origin = (ox, oy)
+
+        # Warp only over the frame's own bounding box, then paste it in
+        translate = np.array([[1, 0, -fx0],
+                              [0, 1, -fy0],
+                              [0, 0, 1]], dtype=np.float32)
+        warped = cv2.warpPerspective(frame, translate @ H, (fx1 - fx0, fy1 - fy0))
+        self._blend(self._mosaic[fy0 - oy:fy1 - oy, fx0 - ox:fx1 - ox], warped)
+
+    @staticmethod
+    def _blend(canvas: np.ndarray, warped: np.ndarray):
+        """Copy the non-black pixels of `warped` onto the BGR `canvas` (same size)."""
+        if warped.ndim == 2:
+            # Grayscale frame: fill all three canvas channels
+            mask = warped > 0
+            canvas[mask] = warped[mask][:, None]
+        else:
+            mask = warped.any(axis=2)
+            canvas[mask] = warped[mask]
+
     def stitch(self, frames: List[np.ndarray]) -> Optional[np.ndarray]:
         """
         Stitch a list of frames and return the final mosaic.
         This is a convenience method that resets, adds all frames, and builds.
+        It re-stitches everything on each call: during a scan, feed frames to
+        append_and_get() instead.
         
         :param frames: List of frames to stitch
         :return: Stitched mosaic image or None if failed
@@ -111,7 +208,11 @@ class Stitcher:
         """
         Build the final stitched image.
         Returns None if no images exist.
+        After append_and_get(), returns its running mosaic.
         """
+        if self._mosaic is not None:
+            return self._mosaic
+
         if not self.frames:
             return None
 
@@ -147,8 +248,7 @@ class Stitcher:
             warp_mat = translate @ H
             warped = cv2.warpPerspective(frame, warp_mat, (width, height))
 
-            mask = (warped.sum(axis=2) > 0)
-            mosaic[mask] = warped[mask]
+            self._blend(mosaic, warped)
 
         return mosaic
     
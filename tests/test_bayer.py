@@ -0,0 +1,129 @@
+import numpy as np
+import pytest
+
+from backend.camera.imx477 import IMX477Camera, _bayer_means
+
+
+def _reference_means(mosaic):
+    """Per-channel RGGB means computed the plain float64 way."""
+    h, w = mosaic.shape
+    even = mosaic[: h - h % 2, : w - w % 2].astype(np.float64)
+    r = even[0::2, 0::2].mean()
+    g = (even[0::2, 1::2].mean() + even[1::2, 0::2].mean()) / 2.0
+    b = even[1::2, 1::2].mean()
+    return r, g, b
+
+
+@pytest.mark.parametrize("dtype, high", [(np.uint16, 4096), (np.uint8, 256), (np.int32, 1 << 20)])
+def test_bayer_means_match_float_reference(dtype, high):
+    rng = np.random.default_rng(1)
+    mosaic = rng.integers(0, high, (64, 96), dtype=dtype)
+
+    assert _bayer_means(mosaic) == pytest.approx(_reference_means(mosaic))
+
+
+def test_bayer_means_ignore_incomplete_cells():
+    rng = np.random.default_rng(2)
+    mosaic = rng.integers(0, 4096, (65, 97), dtype=np.uint16)
+
+    assert _bayer_means(mosaic) == pytest.approx(_reference_means(mosaic))
+    assert _bayer_means(mosaic) == pytest.approx(_bayer_means(mosaic[:64, :96]))
+
+
+def test_bayer_means_per_channel():
+    mosaic = np.empty((4, 6), dtype=np.uint16)
+    mosaic[0::2, 0::2] = 100  # R
+    mosaic[0::2, 1::2] = 200  # G (red rows)
+    mosaic[1::2, 0::2] = 400  # G (blue rows)
+    mosaic[1::2, 1::2] = 50   # B
+
+    assert _bayer_means(mosaic) == pytest.approx((100.0, 300.0, 50.0))
+
+
+def test_bayer_means_of_float_data():
+    rng = np.random.default_rng(3)
+    mosaic = rng.random((32, 48), dtype=np.float32)
+
+    assert _bayer_means(mosaic) == pytest.approx(_reference_means(mosaic), rel=1e-5)
+
+
+def test_bayer_means_without_complete_cells():
+    assert _bayer_means(np.zeros((1, 7), dtype=np.uint16)) == (0.0, 0.0, 0.0)
+
+
+@pytest.fixture
+def camera():
+    # No Picamera2 needed: normalization only touches the array
+    cam = IMX477Camera()
+    yield cam
+    cam.shutdown()
+
+
+def test_normalize_returns_uint16_unchanged(camera):
+    arr = np.arange(24, dtype=np.uint16).reshape(4, 6)
+    out = np.full_like(arr, 7)
+
+    assert camera._normalize_bayer_to_uint16(arr, out=out) is arr
+    assert (out == 7).all()
+
+
+def test_normalize_widens_uint8(camera):
+    arr = np.array([[0, 1], [128, 255]], dtype=np.uint8)
+
+    result = camera._normalize_bayer_to_uint16(arr)
+
+    assert result.dtype == np.uint16
+    assert np.array_equal(result, arr.astype(np.uint16) << 8)
+
+
+def test_normalize_writes_into_out(camera):
+    arr = np.array([[0, 1], [128, 255]], dtype=np.uint8)
+    out = np.zeros(arr.shape, dtype=np.uint16)
+
+    assert camera._normalize_bayer_to_uint16(arr, out=out) is out
+    assert np.array_equal(out, arr.astype(np.uint16) << 8)
+
+
+def test_normalize_scales_12_bit_integers(camera):
+    arr = np.array([[0, 1], [2048, 4095]], dtype=np.int32)
+
+    result = camera._normalize_bayer_to_uint16(arr)
+
+    assert result.dtype == np.uint16
+    assert np.array_equal(result, arr.astype(np.uint16) << 4)
+
+
+@pytest.mark.parametrize("dtype", [np.float32, np.float64])
+def test_normalize_stretches_float_range(camera, dtype):
+    rng = np.random.default_rng(4)
+    arr = (rng.random((16, 24)) * 3.0 - 1.0).astype(dtype)
+
+    result = camera._normalize_bayer_to_uint16(arr)
+
+    lo, hi = float(arr.min()), float(arr.max())
+    expected = (arr.astype(np.float64) - lo) * (65535.0 / (hi - lo))
+    assert result.dtype == np.uint16
+    assert result.min() == 0 and result.max() >= 65534
+    assert np.abs(result.astype(np.int64) - expected.astype(np.int64)).max() <= 1
+
+
+def test_normalize_constant_float_gives_zeros(camera):
+    out = np.full((4, 4), 9, dtype=np.uint16)
+
+    result = camera._normalize_bayer_to_uint16(np.full((4, 4), 0.5, dtype=np.float32), out=out)
+
+    assert result is out
+    assert not out.any()
+
+
+def test_normalize_float_with_known_bit_depth(camera):
+    camera._raw_bit_depth = 12
+    arr = np.array([[0.0, 1.0], [2048.0, 4095.0]], dtype=np.float32)
+
+    result = camera._normalize_bayer_to_uint16(arr)
+
+    # Scaled by the sensor range, not by the frame's own min/max
+    expected = np.rint(arr.astype(np.float64) * (65535.0 / 4095.0))
+    assert result.dtype == np.uint16
+    assert np.abs(result - expected).max() <= 1  # float32 scratch rounding
+    assert result[1, 1] == 65535
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from backend.pipeline.controller import THUMBNAIL_SIZE, PipelineController
+
+
+@pytest.fixture
+def controller(tmp_path, monkeypatch):
+    # Simulated GPIO; without Picamera2 the camera only logs a warning
+    monkeypatch.setenv("NEGANUKI_SIMULATE_GPIO", "1")
+    ctl = PipelineController(str(tmp_path))
+    yield ctl
+    ctl.shutdown()
+
+
+def _frame(h, w):
+    rng = np.random.default_rng(5)
+    return rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+
+
+def test_spilled_frame_loads_back_unchanged(controller):
+    frame = _frame(600, 800)
+
+    record = controller._spill_frame(frame)
+
+    assert record.index == 0
+    assert record.path.parent == controller.frames_dir
+    assert np.array_equal(record.load(), frame)
+    assert record.path.exists()
+
+
+def test_spill_keeps_only_a_thumbnail(controller):
+    record = controller._spill_frame(_frame(600, 800))
+
+    assert record.thumbnail.shape == (384, THUMBNAIL_SIZE, 3)
+    assert record.thumbnail.dtype == np.uint8
+
+
+def test_spill_indexes_follow_the_frame_list(controller):
+    for _ in range(3):
+        controller.frames.append(controller._spill_frame(_frame(60, 80)))
+
+    assert [r.index for r in controller.frames] == [0, 1, 2]
+    assert len({r.path for r in controller.frames}) == 3
+
+
+def test_shutdown_flushes_pending_writes(tmp_path, monkeypatch):
+    monkeypatch.setenv("NEGANUKI_SIMULATE_GPIO", "1")
+    controller = PipelineController(str(tmp_path))
+    for _ in range(4):
+        controller.frames.append(controller._spill_frame(_frame(300, 400)))
+
+    controller.shutdown()
+
+    assert all(r.saved.done() for r in controller.frames)
+    assert all(r.path.exists() for r in controller.frames)
@@ -0,0 +1,128 @@
+import cv2
+import numpy as np
+import pytest
+
+from backend.pipeline.stitcher import Stitcher
+
+
+FRAME_H, FRAME_W = 480, 400
+SHIFT = 120  # rows the film moves between frames (75% overlap)
+
+
+def _film(n_frames):
+    """A strip of blocky random texture long enough for `n_frames` overlapping frames."""
+    rng = np.random.default_rng(0)
+    height = FRAME_H + SHIFT * (n_frames - 1)
+    blocks = rng.integers(0, 256, (height // 8, FRAME_W // 8, 3), dtype=np.uint8)
+    return cv2.resize(blocks, (FRAME_W, height), interpolation=cv2.INTER_NEAREST)
+
+
+def _pan(n_frames):
+    film = _film(n_frames)
+    return film, [film[i * SHIFT:i * SHIFT + FRAME_H].copy() for i in range(n_frames)]
+
+
+def _best_offset_diff(a, b):
+    """Mean absolute difference of `a` and `b` at their best alignment within one pixel.
+
+    append_and_get() rounds the warped bounds outwards (floor/ceil), build()
+    truncates them, so the two mosaics may be offset by a pixel and differ by
+    up to two in size.
+    """
+    best = np.inf
+    for dy in (-1, 0, 1):
+        for dx in (-1, 0, 1):
+            a_part = a[max(dy, 0):, max(dx, 0):]
+            b_part = b[max(-dy, 0):, max(-dx, 0):]
+            h = min(a_part.shape[0], b_part.shape[0])
+            w = min(a_part.shape[1], b_part.shape[1])
+            diff = np.abs(a_part[:h, :w].astype(np.int16) - b_part[:h, :w]).mean()
+            best = min(best, diff)
+    return best
+
+
+def test_append_and_get_matches_stitch():
+    _, frames = _pan(5)
+
+    incremental = Stitcher()
+    for frame in frames:
+        mosaic = incremental.append_and_get(frame)
+    expected = Stitcher().stitch(frames)
+
+    assert mosaic is not None and expected is not None
+    assert abs(mosaic.shape[0] - expected.shape[0]) <= 2
+    assert abs(mosaic.shape[1] - expected.shape[1]) <= 2
+    assert _best_offset_diff(mosaic, expected) < 1.0
+
+
+def test_append_and_get_reconstructs_the_film():
+    film, frames = _pan(4)
+
+    stitcher = Stitcher()
+    for frame in frames:
+        mosaic = stitcher.append_and_get(frame)
+
+    assert abs(mosaic.shape[0] - film.shape[0]) <= 2
+    # Sub-pixel homographies blur the block edges a little; a misplaced frame
+    # would leave a difference near that of unrelated noise (~85)
+    assert _best_offset_diff(mosaic, film) < 8.0
+
+
+def test_append_and_get_keeps_only_the_latest_frame():
+    _, frames = _pan(4)
+
+    stitcher = Stitcher()
+    for frame in frames:
+        stitcher.append_and_get(frame)
+
+    assert len(stitcher.frames) == 1
+    assert stitcher.frames[0] is frames[-1]
+
+
+def test_build_returns_the_running_mosaic():
+    _, frames = _pan(3)
+
+    stitcher = Stitcher()
+    for frame in frames:
+        mosaic = stitcher.append_and_get(frame)
+
+    assert stitcher.build() is mosaic
+
+
+def test_append_and_get_includes_frames_added_before():
+    _, frames = _pan(4)
+
+    stitcher = Stitcher()
+    stitcher.add_frame(frames[0])
+    stitcher.add_frame(frames[1])
+    for frame in frames[2:]:
+        mosaic = stitcher.append_and_get(frame)
+
+    assert _best_offset_diff(mosaic, Stitcher().stitch(frames)) < 1.0
+
+
+def test_add_frame_after_append_and_get_requires_reset():
+    _, frames = _pan(2)
+
+    stitcher = Stitcher()
+    stitcher.append_and_get(frames[0])
+    with pytest.raises(RuntimeError):
+        stitcher.add_frame(frames[1])
+
+    stitcher.reset()
+    stitcher.add_frame(frames[1])
+    assert stitcher.build() is frames[1]
+
+
+def test_append_and_get_accepts_grayscale_frames():
+    _, frames = _pan(3)
+    grays = [cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) for frame in frames]
+
+    stitcher = Stitcher()
+    for gray in grays:
+        mosaic = stitcher.append_and_get(gray)
+
+    assert mosaic.ndim == 3 and mosaic.shape[2] == 3
+    # Every channel carries the grayscale value
+    assert np.array_equal(mosaic[..., 0], mosaic[..., 1])
+    assert np.array_equal(mosaic[..., 0], mosaic[..., 2])